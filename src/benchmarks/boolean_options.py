@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the boolean options (see: keys/boolean.py, PerfConfig.boolean_*) against OCCT's defaults.
+
+The keyboard is built once, then the same unify (PerfConfig.fuse_method) runs with plain and with the configured boolean options.
+Time is the best of some rounds; the boolean operations and their accumulated time are those of the last round run by this process
+(fuse methods running in worker processes with --jobs are only timed as a whole).
+
+usage (from the repository root, takes the arguments of main.py):
+    python src/benchmarks/boolean_options.py --no-disk-cache
+"""
+import os
+import sys
+
+sys.path[:0] = [os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))]
+
+from time import perf_counter
+from typing import List, Tuple
+
+import cadquery
+from model_importer import import_config, import_builder
+from src.cfg.debug import DEBUG
+from src.cfg.perf import PERF
+from src.keys import boolean
+from src.keys.fuse import fuse
+from src.keys.utils import KeyUtils
+
+ROUNDS = 3
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def measure(groups: List[List[cadquery.Workplane]], options: bool) -> Tuple[float, int, float, float]:
+    """
+    @return: best time, boolean operations and their time of the last round, volume of the union
+    """
+    PERF.boolean_options = options
+    best = None
+    union = None
+    for _ in range(ROUNDS):
+        counters = boolean.BOOLEAN_STATISTICS.counters()
+        begin = perf_counter()
+        union = fuse(groups, PERF.fuse_method, clean=False, jobs=PERF.jobs)
+        elapsed = perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    operations, seconds = boolean.BOOLEAN_STATISTICS.counters()
+    return best, operations - counters[0], seconds - counters[1], union.val().Volume()
+
+
+def run() -> None:
+    import_config()
+    builder = import_builder()
+    configured = PERF.boolean_options
+    key_matrix = builder.compute(do_unify=True)
+    groups = [KeyUtils.squash_objects(key) for row in key_matrix for key in row
+              if key.base.is_visible or DEBUG.show_invisibles]
+
+    results = list()  # type: List[Tuple[str, float, int, float, float]]
+    for name, options in [("plain", False), ("configured", True)]:
+        results.append((name,) + measure(groups, options))
+    summary = boolean.options_summary()
+    PERF.boolean_options = configured
+
+    print("\nfuse method: {}, {} objects, best of {} rounds".format(PERF.fuse_method, sum(len(group) for group in groups), ROUNDS))
+    print("configured options: {}".format(summary))
+    print("\n{:<12} {:>10} {:>10} {:>14} {:>14}".format("options", "time [s]", "booleans", "boolean [s]", "volume [mm³]"))
+    for name, elapsed, operations, seconds, volume in results:
+        print("{:<12} {:>10.3f} {:>10} {:>14.3f} {:>14.3f}".format(name, elapsed, operations, seconds, volume))
+    print("difference: {:+.3f}s ({:+.1f}%)".format(results[1][1] - results[0][1], (results[1][1] / results[0][1] - 1) * 100 if results[0][1] > 0 else 0.0))
+
+
+if __name__ == "__main__":
+    run()
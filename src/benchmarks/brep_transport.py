@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro benchmark of the transports passing cad objects from worker processes to the main process (see: keys/transport.py).
+
+The model's switch slots and connectors are built once, then each transport sends all of them back from a process pool:
+  - pickle:        cadquery shapes pickled through the pool's pipe
+  - bytes:         binary BREP pickled through the pool's pipe
+  - temp-file:     binary BREP written to temporary files, only the file names are pickled
+  - shared-memory: binary BREP in shared memory blocks, only the handles are pickled;
+                   one copy into the block on send, one copy out of the block on receive (OCP's stream adapter reads bytes only,
+                   there is no zero-copy read)
+
+usage (from the repository root, takes the arguments of main.py):
+    python src/benchmarks/brep_transport.py --keyboard-size S100 --no-disk-cache
+"""
+import os
+import sys
+
+sys.path[:0] = [os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))]
+
+import tempfile
+from time import perf_counter
+from typing import List, Any, Callable, Tuple
+
+import cadquery
+from model_importer import import_config, import_builder
+from src.cfg.perf import PERF
+from src.keys.brep import workplane_to_brep, workplane_from_brep
+from src.keys.parallel import process_pool
+from src.keys.transport import send_shape, receive_shape
+
+ROUNDS = 3
+
+_shapes = list()  # type: List[cadquery.Workplane]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def _init_worker(breps: List[bytes]) -> None:
+    _shapes.extend(workplane_from_brep(data) for data in breps)
+
+
+def _send_pickle(i: int) -> Any:
+    return _shapes[i].vals()
+
+
+def _receive_pickle(data: Any) -> cadquery.Workplane:
+    return cadquery.Workplane().add(data)
+
+
+def _send_bytes(i: int) -> Any:
+    return workplane_to_brep(_shapes[i])
+
+
+def _send_temp_file(i: int) -> Any:
+    handle, filename = tempfile.mkstemp(suffix=".brep")
+    with os.fdopen(handle, "wb") as f:
+        f.write(workplane_to_brep(_shapes[i]))
+    return filename
+
+
+def _receive_temp_file(filename: str) -> cadquery.Workplane:
+    with open(filename, "rb") as f:
+        obj = workplane_from_brep(f.read())
+    os.remove(filename)
+    return obj
+
+
+def _send_shared_memory(i: int) -> Any:
+    return send_shape(_shapes[i])
+
+
+TRANSPORTS = [
+    ("pickle", _send_pickle, _receive_pickle),
+    ("bytes", _send_bytes, workplane_from_brep),
+    ("temp-file", _send_temp_file, _receive_temp_file),
+    ("shared-memory", _send_shared_memory, receive_shape),
+]  # type: List[Tuple[str, Callable[[int], Any], Callable[[Any], cadquery.Workplane]]]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def collect_shapes() -> List[cadquery.Workplane]:
+    builder = import_builder()
+    key_matrix = builder.compute(do_unify=False)
+    shapes = list()  # type: List[cadquery.Workplane]
+    for row in key_matrix:
+        for key in row:
+            shapes.append(key.slot.get_cad_object())
+            shapes.extend(obj for _, obj in key.cad_objects.connectors if obj is not None)
+    return shapes
+
+
+def run() -> None:
+    import_config()
+    shapes = collect_shapes()
+    breps = [workplane_to_brep(obj) for obj in shapes]
+    jobs = max(2, PERF.jobs)
+    print("\n{} shapes (slots and connectors), {:,} kB binary BREP, {} worker processes, best of {} rounds".format(
+        len(shapes), sum(len(data) for data in breps) // 1024, jobs, ROUNDS))
+
+    for name, send, receive in TRANSPORTS:
+        PERF.shape_transport = "shared-memory" if name == "shared-memory" else "bytes"
+        with process_pool(jobs, _init_worker, (breps,)) as executor:
+            best = None
+            for _ in range(ROUNDS):
+                begin = perf_counter()
+                received = [receive(data) for data in executor.map(send, range(len(shapes)), chunksize=16)]
+                elapsed = perf_counter() - begin
+                best = elapsed if best is None else min(best, elapsed)
+            assert len(received) == len(shapes)
+        print("  {:<14} {:8.3f}s  {:8.1f}µs/shape".format(name, best, best / len(shapes) * 1e6))
+    print("note: shared-memory is not zero-copy; OCP's stream adapter reads bytes objects, thus the receiver copies each block once")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check of key name labels composed from cached glyphs (see: keys/label.py) vs. cadquery's text().
+
+For "Enter" and every key name of the layout the composed wires must match the bottom face wires of text(name, size, height):
+same number of wires and edges, same bounding box and same total edge length within the tolerance.
+Time is the best of some rounds for all names; the glyphs are cached by the first composition.
+
+usage (from the repository root, takes the arguments of main.py):
+    python src/benchmarks/label.py --no-disk-cache
+"""
+import os
+import sys
+
+sys.path[:0] = [os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))]
+
+from time import perf_counter
+from typing import List, Callable
+
+import cadquery
+from model_importer import import_config, import_builder
+from src.keys.key import Key
+from src.keys.label import KeyLabel
+
+ROUNDS = 3
+SIZE = 5
+HEIGHT = 1
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def text_wires(name: str) -> cadquery.Workplane:
+    return cadquery.Workplane().text(name, SIZE, HEIGHT).faces("<Z").wires()
+
+
+def assert_match(name: str, composed: cadquery.Workplane, rendered: cadquery.Workplane, tolerance: float = 1e-4) -> None:
+    wires_a, wires_b = composed.vals(), rendered.vals()
+    assert len(wires_a) == len(wires_b), "{}: {} vs. {} wires".format(name, len(wires_a), len(wires_b))
+    compound_a, compound_b = cadquery.Compound.makeCompound(wires_a), cadquery.Compound.makeCompound(wires_b)
+    assert len(compound_a.Edges()) == len(compound_b.Edges()), "{}: {} vs. {} edges".format(name, len(compound_a.Edges()), len(compound_b.Edges()))
+
+    box_a, box_b = compound_a.BoundingBox(), compound_b.BoundingBox()
+    values_a = [box_a.xmin, box_a.ymin, box_a.zmin, box_a.xmax, box_a.ymax, box_a.zmax, sum(e.Length() for e in compound_a.Edges())]
+    values_b = [box_b.xmin, box_b.ymin, box_b.zmin, box_b.xmax, box_b.ymax, box_b.zmax, sum(e.Length() for e in compound_b.Edges())]
+    assert all(abs(x - y) < tolerance for x, y in zip(values_a, values_b)), "{}: {} != {}".format(name, values_a, values_b)
+
+
+def measure(names: List[str], render: Callable[[str], cadquery.Workplane]) -> float:
+    best = None
+    for _ in range(ROUNDS):
+        begin = perf_counter()
+        [render(name) for name in names]
+        elapsed = perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run() -> None:
+    import_config()
+    builder = import_builder()
+    key_matrix = builder.build_key_matrix()
+    names = ["Enter"] + sorted({key.name for row in key_matrix for key in row if len(key.name.strip()) > 0})
+
+    label = KeyLabel(Key.object_cache, SIZE, HEIGHT)
+    for name in names:
+        assert_match(name, label.compose(name), text_wires(name))
+    print("{} labels match text()".format(len(names)))
+
+    print("\n{} labels, best of {} rounds".format(len(names), ROUNDS))
+    for method, render in [("text()", text_wires), ("composed", label.compose)]:
+        elapsed = measure(names, render)
+        print("  {:<9} {:8.3f}s  {:8.1f}µs/label".format(method, elapsed, elapsed / len(names) * 1e6))
+
+
+if __name__ == "__main__":
+    run()
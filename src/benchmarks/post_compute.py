@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the key placement after computation (see: CadKeyMixin.final_post_compute).
+
+The key components (base, cap, slot, switch) are computed at the coordinate origin once, then placed by
+  - rotate/translate: three rotations and one translation per component, each one copies the shape
+  - location:         one composed location per key, the shapes are moved without copying the geometry
+for the planar layout and for a layout where every key is rotated.
+Time is the best of some rounds, memory is the growth of the resident set size while all placed components are held.
+Both methods must yield the same volume, bounding box and center per component.
+
+usage (from the repository root, takes the arguments of main.py):
+    python src/benchmarks/post_compute.py --no-disk-cache
+"""
+import os
+import sys
+
+sys.path[:0] = [os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))]
+
+import ctypes
+import gc
+from time import perf_counter
+from typing import List, Callable, Optional, Tuple
+
+import cadquery
+from model_importer import import_config, import_builder
+from src.cfg.debug import DEBUG
+from src.keys.key import Key
+from src.keys.key_mixins import KeyPlane
+
+ROUNDS = 3
+ROTATION_OFFSET = (3, -2, 1)
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def resident_memory() -> Optional[int]:
+    """
+    @return: resident set size in [bytes] if available (linux only)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def release_memory() -> None:
+    """
+    Returns freed memory to the operating system (glibc only) so that the resident set size growth of a method does not depend on the methods run before.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def compute_at_origin(key: Key) -> List[cadquery.Workplane]:
+    """
+    The key components before placement (see: Key.compute).
+    """
+    key.base.compute(cache=Key.object_cache)
+    key.cap.compute(cache=Key.object_cache)
+    key.slot.compute(cap=key.cap, do_fill=key.base.is_filled, cache=Key.object_cache, cartesian_root=key.base.relative_cartesian)
+    components = [key.base.get_cad_object(), key.cap.get_cad_object(), key.slot.get_cad_object()]
+    if DEBUG.render_switch:
+        key.switch.compute(cache=Key.object_cache)
+        components.append(key.switch.get_cad_object())
+    return components
+
+
+def place_by_rotate_translate(key: Key, components: List[cadquery.Workplane]) -> List[cadquery.Workplane]:
+    origin, relative, (rx, ry, rz) = key.base.ABSOLUTE_CARTESIAN.origin, key.base.relative_cartesian, key.base.total_rotation
+    return [c.rotate(origin, relative.z_axis, rz)
+            .rotate(origin, relative.x_axis, rx)
+            .rotate(origin, relative.y_axis, ry)
+            .translate(tuple(key.base.total_translation)) for c in components]
+
+
+def place_by_location(key: Key, components: List[cadquery.Workplane]) -> List[cadquery.Workplane]:
+    location = key.placement_location()
+    return [key.place(c, location) for c in components]
+
+
+METHODS = [
+    ("rotate/translate", place_by_rotate_translate),
+    ("location", place_by_location),
+]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def assert_equal(a: List[List[cadquery.Workplane]], b: List[List[cadquery.Workplane]], tolerance: float = 1e-6) -> None:
+    for components_a, components_b in zip(a, b):
+        for component_a, component_b in zip(components_a, components_b):
+            shape_a, shape_b = component_a.val(), component_b.val()
+            box_a, box_b = shape_a.BoundingBox(), shape_b.BoundingBox()
+            values_a = [box_a.xmin, box_a.ymin, box_a.zmin, box_a.xmax, box_a.ymax, box_a.zmax] + list(shape_a.Center().toTuple())
+            values_b = [box_b.xmin, box_b.ymin, box_b.zmin, box_b.xmax, box_b.ymax, box_b.zmax] + list(shape_b.Center().toTuple())
+            assert all(abs(x - y) < tolerance for x, y in zip(values_a, values_b)), "{} != {}".format(values_a, values_b)
+            assert abs(shape_a.Volume() - shape_b.Volume()) < tolerance
+
+
+def measure(keys: List[Key], components: List[List[cadquery.Workplane]],
+            place: Callable[[Key, List[cadquery.Workplane]], List[cadquery.Workplane]]) -> Tuple[float, Optional[int], List[List[cadquery.Workplane]]]:
+    release_memory()
+    memory_before = resident_memory()
+    placed = [place(key, c) for key, c in zip(keys, components)]
+    memory_after = resident_memory()
+
+    best = None
+    for _ in range(ROUNDS):
+        begin = perf_counter()
+        [place(key, c) for key, c in zip(keys, components)]
+        elapsed = perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best, None if memory_before is None else memory_after - memory_before, placed
+
+
+def run() -> None:
+    import_config()
+    builder = import_builder()
+    key_matrix = builder.build_key_matrix()
+    builder.apply_orientation_offset(key_matrix)
+    builder.apply_translation_offset(key_matrix)
+    builder.compute_placement_and_cad_objects(key_matrix)
+    keys = [key for row in key_matrix for key in row]  # type: List[Key]
+
+    for layout in ["planar", "rotated"]:
+        if layout == "rotated":
+            for key in keys:
+                key.base.rotation_offset = ROTATION_OFFSET
+            KeyPlane.compute_relative_cardinal_rotations([key.base for key in keys])
+        components = [compute_at_origin(key) for key in keys]
+        print("\n{} layout: {} keys, {} components, best of {} rounds".format(layout, len(keys), sum(len(c) for c in components), ROUNDS))
+
+        results = list()  # type: List[List[List[cadquery.Workplane]]]
+        for name, place in METHODS:
+            elapsed, memory, placed = measure(keys, components, place)
+            results.append(placed)
+            print("  {:<17} {:8.3f}s  {:8.1f}µs/key  {:>12} kB".format(
+                name, elapsed, elapsed / len(keys) * 1e6, "n/a" if memory is None else "{:,}".format(memory // 1024)))
+        assert_equal(results[0], results[1])
+        del results
+        release_memory()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the fuse methods of the unify squash method (see: keys/fuse.py, PerfConfig.fuse_method) for each keyboard size.
+
+Each keyboard size is built once, then all fuse methods unify the same objects; times are also given relative to the configured
+method (PerfConfig.fuse_method), i.e. the one of the unify squash method.
+Sizes not supported by the selected layout (i.e. its connection mapping) are skipped.
+
+usage (from the repository root, takes the arguments of main.py):
+    python src/benchmarks/union.py --no-disk-cache
+"""
+import os
+import sys
+
+sys.path[:0] = [os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))]
+
+from time import perf_counter
+from typing import List, Tuple
+
+from keyboard_size import KeyboardSize
+from model_importer import import_config, import_builder
+from src.cfg.debug import DEBUG
+from src.cfg.perf import PERF
+from src.cli_args import cli_args
+from src.keys.fuse import fuse
+from src.keys.utils import KeyUtils
+
+METHODS = ["sequential", "tree", "multi", "clustered", "glue"]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def run() -> None:
+    _, model_config = import_config()
+    builder = import_builder()
+    results = list()  # type: List[Tuple[str, int, str, float, float, int]]
+
+    for size in KeyboardSize:
+        # the layout reads the keyboard size from the src package's cli arguments
+        cli_args().keyboard_size = size
+        model_config.MODEL_CONFIG.matrix.layout_size = size
+        try:
+            key_matrix = builder.compute(do_unify=True)
+        except (AssertionError, IndexError) as e:
+            print("{}: not supported by the layout ({})".format(size.name, repr(e)))
+            results.append((size.name, 0, "skipped", 0.0, 0.0, 0))
+            continue
+
+        groups = [KeyUtils.squash_objects(key) for row in key_matrix for key in row
+                  if key.base.is_visible or DEBUG.show_invisibles]
+        for method in METHODS:
+            begin = perf_counter()
+            union = fuse(groups, method, clean=False, jobs=PERF.jobs)
+            elapsed = perf_counter() - begin
+            results.append((size.name, sum(len(group) for group in groups), method, elapsed, union.val().Volume(), len(union.val().Faces())))
+
+    # relative to the configured method of the unify squash method
+    reference = {size: elapsed for size, _, method, elapsed, _, _ in results if method == PERF.fuse_method}
+    print("\n{:<6} {:>8} {:<12} {:>10} {:>12} {:>14} {:>8}".format("size", "objects", "method", "time [s]", "vs. " + PERF.fuse_method, "volume [mm³]", "faces"))
+    for size, objects, method, elapsed, volume, faces in results:
+        relative = "{:.2f}×".format(elapsed / reference[size]) if reference.get(size, 0.0) > 0 else "-"
+        print("{:<6} {:>8} {:<12} {:>10.3f} {:>12} {:>14.3f} {:>8}".format(size, objects, method, elapsed, relative, volume, faces))
+
+
+if __name__ == "__main__":
+    run()
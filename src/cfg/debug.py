@@ -3,10 +3,8 @@ class DebugConfig(object):
         """
         Configuration fot enable/disable features/items for development.
 
-        Note: unified vs unified + clean vs assembly:
-          assembly:        about 10 seconds
-          unified:         about  1 minute
-          unified + clean: about 10 minutes
+        Note: unified vs unified + clean vs assembly: the assembly is fastest, the timings of unified and unified + clean
+              depend on the fuse and clean method (see: PerfConfig.fuse_method, PerfConfig.clean_mode, benchmarks/union.py)
 
         self.debug_enable: global switch to enable ir disable debug
 
@@ -0,0 +1,74 @@
+import math
+import os
+
+
+class PerfConfig(object):
+    def __init__(self):
+        """
+        Configuration of caching and other performance related features.
+        Values may be overridden by command line arguments (see: cli_args.py).
+
+        self.use_disk_cache: persist cad objects as binary BREP files so that subsequent runs can re-use them; True recommended
+        self.disk_cache_dir: directory of the persistent object cache; the directory can be shared by several processes
+
+        self.object_cache_max_entries: max. number of objects kept in memory; least recently used objects are evicted first
+        self.object_cache_max_brep_size: max. accumulated BREP size in bytes of objects kept in memory; math.inf for no limit (default);
+                                         a limit measures each stored object by a full BREP write, otherwise only the disk cache does
+        self.object_cache_weak_tier: keep evicted objects weakly referenced as long as they are in use elsewhere; True recommended
+        self.cache_key_tolerance: numeric cache key parameters are quantized to multiples of this value (in [mm] or [deg])
+        self.connector_key_tolerance: key tolerance of connector templates; fillers whose local parameters are equal w.r.t. this tolerance
+                                      share their geometry, thus it must not exceed OCCT's confusion tolerance (1e-7 mm) or the faces of
+                                      shared fillers do not coincide with the slot faces (i.e. as required by the "glue" fuse method)
+        self.cache_key_near_miss_quanta: cache misses whose keys differ by at most this number of quanta are listed as near misses; 0 disables
+
+        self.jobs: number of worker processes for cad object construction; 1 computes sequentially, 0 uses all cpu cores
+        self.shape_transport: how worker processes pass cad objects back: "bytes" (binary BREP pickled through the pool's pipe) or
+                              "shared-memory" (binary BREP in shared memory blocks, only handles are pickled); "bytes" recommended
+                              for the small shapes of key components, see: benchmarks/brep_transport.py
+        self.fuse_method: how the unify squash method fuses all objects: "clustered" (one boolean operation per cluster of objects
+                          with overlapping bounding boxes, disjoint clusters are compounded), "multi" (one boolean operation with all
+                          objects), "glue" (slots with their connectors in glue mode, other solids overlapping by bounding box by a normal fuse,
+                          then all at once in glue mode), "tree" (pairwise balanced
+                          tree reduction, levels in parallel with jobs) or "sequential" (one object after another, slowest);
+                          "clustered" recommended, see: benchmarks/union.py
+        self.glue_mode: OCCT's glue option of the "glue" fuse method: "shift" (BOPAlgo_GlueShift) or "full" (BOPAlgo_GlueFull)
+        self.clean_mode: how a clean union unifies same domain faces and edges: "final" (one pass on the final solid), "regional"
+                         (spatial regions fused and cleaned in parallel with jobs, then one pass on the merged regions) or
+                         "incremental" (a pass after each union, slowest); "final" recommended
+        self.assembly_instances: the assembly squash method adds each distinct shape once and refers to it by location per key
+                                 (STEP: shared representations); otherwise each key adds its own placed copy; True recommended
+
+        self.boolean_options: apply the following options to all boolean operations (see: keys/boolean.py); otherwise OCCT defaults
+        self.boolean_parallel: run boolean operations multi-threaded (OCCT's SetRunParallel)
+        self.boolean_fuzzy_value: additional tolerance in [mm] for coincident faces of boolean arguments (fuzzy mode), 0 disables
+        self.boolean_use_obb: use oriented bounding boxes to filter candidate pairs of sub-shapes
+        self.boolean_non_destructive: never modify the arguments; required since arguments may be shared cached objects
+        """
+
+        self.use_disk_cache = True  # type: bool
+        self.disk_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "parametric-model")  # type: str
+
+        self.object_cache_max_entries = 4096  # type: int
+        self.object_cache_max_brep_size = math.inf  # type: float
+        self.object_cache_weak_tier = True  # type: bool
+        self.cache_key_tolerance = 0.0001  # type: float
+        self.connector_key_tolerance = 1e-7  # type: float
+        self.cache_key_near_miss_quanta = 10  # type: int
+
+        self.jobs = 1  # type: int
+        self.shape_transport = "bytes"  # type: str
+        self.fuse_method = "clustered"  # type: str
+        self.glue_mode = "full"  # type: str
+        self.clean_mode = "final"  # type: str
+        self.assembly_instances = True  # type: bool
+
+        self.boolean_options = True  # type: bool
+        self.boolean_parallel = True  # type: bool
+        self.boolean_fuzzy_value = 0.0  # type: float
+        self.boolean_use_obb = True  # type: bool
+        self.boolean_non_destructive = True  # type: bool
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+PERF = PerfConfig()
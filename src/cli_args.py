@@ -61,6 +61,14 @@ def cli_args() -> argparse.Namespace:
                               help="the keyboard size to generate: influences the layout to compute, not the key size",
                               default=default_size.name,
                               choices=[e.name for e in KeyboardSize])
+    layout_group.add_argument("--tilt",
+                              help="board tilt in [deg] around the front edge (default: see the layout's config.py)",
+                              default=None,
+                              type=float)
+    layout_group.add_argument("--tent",
+                              help="tenting in [deg] of each hand around its outer edge (default: see the layout's config.py)",
+                              default=None,
+                              type=float)
     layout_group.add_argument("-l", "--list",
                               help="list all discovered keyboard layouts and exit",
                               action="store_true")
@@ -79,9 +87,56 @@ def cli_args() -> argparse.Namespace:
                               help="path where to export",
                               default=os.getcwd(),
                               type=str)
+    export_group.add_argument("--partitioned",
+                              help="build, squash and export the left, right, arrow and numpad partition in separate processes "
+                                   "to one step file each",
+                              action="store_true")
+    export_group.add_argument("--combined",
+                              help="if partitioned also export one assembly of all partitions",
+                              action="store_true")
+
+    perf_group = parser.add_argument_group("Performance")
+    perf_group.add_argument("--cache-dir",
+                            help="directory of the persistent cad object cache; may be shared by several processes "
+                                 "(default: see cfg/perf.py)",
+                            default=None,
+                            type=str)
+    perf_group.add_argument("--no-disk-cache",
+                            help="do not read or write the persistent cad object cache",
+                            action="store_true")
+    perf_group.add_argument("-j", "--jobs",
+                            help="number of worker processes computing cad objects; 0 uses all cpu cores "
+                                 "(default: see cfg/perf.py)",
+                            default=None,
+                            type=int)
+    perf_group.add_argument("--shape-transport",
+                            help="how worker processes pass cad objects back (default: see cfg/perf.py)",
+                            choices=["shared-memory", "bytes"],
+                            default=None,
+                            type=str)
+    perf_group.add_argument("--fuse-method",
+                            help="how the unified export fuses all objects (default: see cfg/perf.py)",
+                            choices=["clustered", "glue", "multi", "tree", "sequential"],
+                            default=None,
+                            type=str)
+    perf_group.add_argument("--clean-mode",
+                            help="how a clean union unifies same domain faces and edges (default: see cfg/perf.py)",
+                            choices=["final", "regional", "incremental"],
+                            default=None,
+                            type=str)
+    perf_group.add_argument("--no-instances",
+                            help="export each key's placed copy of its shapes instead of shared shapes referred to by location",
+                            action="store_true")
+    perf_group.add_argument("--plain-booleans",
+                            help="run boolean operations with OCCT defaults instead of the boolean options (see: benchmarks/boolean_options.py for a comparison)",
+                            action="store_true")
+    perf_group.add_argument("--fuzzy-value",
+                            help="fuzzy tolerance in [mm] of boolean operations, 0 disables (default: see cfg/perf.py)",
+                            default=None,
+                            type=float)
 
     config_group = parser.add_argument_group("Configuration")
-    config_group.description = "main config: cfg/debug.py, layout configs: /keyboards/<model_name>/config.py"
+    config_group.description = "main config: cfg/debug.py, performance config: cfg/perf.py, layout configs: /keyboards/<model_name>/config.py"
 
     parser.epilog = ("This script can be either started standalone or run by cadquery editor (cq-editor). "
                      "If run by cq-editor change the working directory to the src path, "
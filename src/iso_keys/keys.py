@@ -1,8 +1,8 @@
-from types import MethodType
-
 import cadquery
 
 from src.keys.canonical_keys import *
+from src.keys.selectors import SELECTORS
+from src.keys import boolean
 from src import model_importer
 
 _cliargs, config = model_importer.import_config()
@@ -134,6 +134,107 @@ class PageDown(Key100Unit):
         self.name = "PDN"
 
 
+class IsoEnterKeyCap(KeyCap):
+    """
+    The iso enter key cap is not a simple box thus we compose it of two combined boxes spanning two rows.
+    """
+
+    cache_namespace = "iso-enter-cap"
+
+    def cache_parameters(self) -> Tuple:
+        return self.width, self.depth, self.unit_length
+
+    def construct(self) -> cadquery.Workplane:
+        back_part = cadquery.Workplane() \
+            .wedge(self.width,  # key width; unit_length * 1.75
+                   self.thickness,  # key height
+                   self.unit_length - self.depth_clearance,  # key depth
+                   self.dish_inset,
+                   self.dish_inset,
+                   self.width - self.dish_inset,
+                   self.unit_length - self.depth_clearance - self.dish_inset,
+                   centered=(True, False, False)) \
+            .rotate((0, 0, 0), (1, 0, 0), 90) \
+            .translate((-1.75, self.unit_length - self.depth_clearance / 2, self.z_clearance))
+
+        front_part = cadquery.Workplane() \
+            .wedge(self.unit_length * 1.25 - self.depth_clearance,  # key width
+                   self.thickness,  # key height
+                   self.unit_length,  # key depth
+                   self.dish_inset,
+                   -self.dish_inset,
+                   self.unit_length * 1.25 - self.depth_clearance - self.dish_inset,
+                   self.unit_length - self.dish_inset,
+                   centered=(False, False, False)) \
+            .rotate((0, 0, 0), (1, 0, 0), 90) \
+            .translate((-1.75 - self.unit_length / 2 + self.width_clearance / 2,
+                        self.depth_clearance / 2,
+                        self.z_clearance))
+
+        return boolean.union(back_part, front_part)
+
+
+class IsoEnterKeySwitchSlot(KeySwitchSlot):
+    """
+    The iso enter key cap is not a simple box, thus the slot is not aligned with the key cap.
+    """
+
+    cache_namespace = "iso-enter-slot"
+
+    def construct(self, basis_face: cadquery.Workplane, do_fill: bool, cartesian_root: CartesianRoot) -> cadquery.Workplane:
+        xz = cartesian_root.zx_normal
+        yz = cartesian_root.yz_normal
+
+        # origin + x_offset = unit_length - depth_clearance - dish_inset
+
+        anchor_edge = basis_face.edges(SELECTORS.get(">{X} and |{Y}", cartesian_root)).val()  # type: cadquery.Edge
+        z_offset = - cadquery.Shape.centerOfMass(anchor_edge).z
+
+        skin = cadquery.Workplane().sketch() \
+            .face(basis_face.edges().vals()).faces(SELECTORS.get("<{Z}", cartesian_root)) \
+            .finalize() \
+            .extrude(-self.thickness) \
+            .translate((0, 0, z_offset))
+
+        if do_fill:
+            return skin
+
+        slot = cadquery.Workplane() \
+            .box(self.slot_width, self.slot_depth, self.thickness) \
+            .translate((0, 0, -self.thickness / 2))
+
+        undercut_front = cadquery.Workplane() \
+            .box(self.undercut_width, self.undercut_depth, self.thickness) \
+            .translate((0, -self.slot_depth / 2 - self.undercut_depth / 2, -self.undercut_thickness - self.thickness / 2))
+        undercut_back = undercut_front.mirror(xz)
+        undercut_left = cadquery.Workplane() \
+            .box(self.undercut_depth, self.undercut_width, self.thickness) \
+            .translate((-self.slot_width / 2 - self.undercut_depth / 2, 0, -self.undercut_thickness - self.thickness / 2))
+        undercut_right = undercut_left.mirror(yz)
+        undercuts = boolean.union(boolean.union(boolean.union(undercut_front, undercut_right), undercut_back), undercut_left)
+
+        return boolean.cut(boolean.cut(skin, slot), undercuts)
+
+    def local_corners(self, cap: IsoEnterKeyCap) -> Tuple:
+        """
+        The back corners belong to the wide back part, the front corners to the narrow front part (see: IsoEnterKeyCap.construct()).
+        """
+        back_left = -cap.width / 2 - 1.75
+        back_right = cap.width / 2 - 1.75
+        front_left = -1.75 - cap.unit_length / 2 + cap.width_clearance / 2
+        front_right = front_left + cap.unit_length * 1.25 - cap.depth_clearance
+        front = cap.depth_clearance / 2 - cap.unit_length
+        back = cap.unit_length - cap.depth_clearance / 2
+
+        return tuple(tuple(((x, y, -self.thickness), (x, y, 0.0))
+                           for x, y in ((front_x, front), (back_x, back)))
+                     for front_x, back_x in ((front_left, back_left), (front_right, back_right)))
+
+
+Key.object_cache.register_namespace(IsoEnterKeyCap.cache_namespace, config.MODEL_CONFIG.cap)
+Key.object_cache.register_namespace(IsoEnterKeySwitchSlot.cache_namespace, config.MODEL_CONFIG.cap, config.MODEL_CONFIG.switch_slot)
+
+
 class IsoEnterKey(Key150Unit):
     """
        ↓ 1.5 unit
@@ -145,102 +246,15 @@ class IsoEnterKey(Key150Unit):
         ↑ 1.25
     """
 
+    cap_type = IsoEnterKeyCap
+    slot_type = IsoEnterKeySwitchSlot
+
     def __init__(self):
         super(IsoEnterKey, self).__init__()
         self.name = "ENT"
         self.base.unit_depth_factor = 2
         self.base.position_offset = [1.75, -config.MODEL_CONFIG.key_base.unit_length / 2, 0]  # position the key base at the center of both lines
 
-        def key_cap_compute(inner_self: KeyCap, outer_self=self, *_args, **_kwargs) -> None:
-            """
-            Override for key cap compute: the key cap is not a simple box thus we compose it of two combined boxes spanning two rows
-            """
-            back_part = cadquery.Workplane() \
-                .wedge(inner_self.width,  # key width; unit_length * 1.75
-                       inner_self.thickness,  # key height
-                       outer_self.base.unit_length - inner_self.depth_clearance,  # key depth
-                       inner_self.dish_inset,
-                       inner_self.dish_inset,
-                       inner_self.width - inner_self.dish_inset,
-                       outer_self.base.unit_length - inner_self.depth_clearance - inner_self.dish_inset,
-                       centered=(True, False, False)) \
-                .rotate((0, 0, 0), (1, 0, 0), 90) \
-                .translate((-1.75, config.MODEL_CONFIG.key_base.unit_length - inner_self.depth_clearance / 2, inner_self.z_clearance))
-
-            front_part = cadquery.Workplane() \
-                .wedge(outer_self.base.unit_length * 1.25 - inner_self.depth_clearance,  # key width
-                       inner_self.thickness,  # key height
-                       outer_self.base.unit_length,  # key depth
-                       inner_self.dish_inset,
-                       -inner_self.dish_inset,
-                       outer_self.base.unit_length * 1.25 - inner_self.depth_clearance - inner_self.dish_inset,
-                       outer_self.base.unit_length - inner_self.dish_inset,
-                       centered=(False, False, False)) \
-                .rotate((0, 0, 0), (1, 0, 0), 90) \
-                .translate((-1.75 - config.MODEL_CONFIG.key_base.unit_length / 2 + inner_self.width_clearance / 2,
-                            inner_self.depth_clearance / 2,
-                            inner_self.z_clearance))
-
-            inner_self._cad_object = back_part.union(front_part)
-
-        def key_slot_compute(inner_self, basis_face: cadquery.Workplane, do_fill: bool, cache: ObjectCache, cartesian_root: Optional[CartesianRoot], outer_self=self, *_args, **_kwargs) -> None:
-            """
-            Override for key slot compute: the key cap is not a simple box, thus the slot is not aligned with the key cap.
-            """
-            x_str = "{}".format(cartesian_root.x_axis)
-            y_str = "{}".format(cartesian_root.y_axis)
-            z_str = "{}".format(cartesian_root.z_axis)
-            xz = cartesian_root.zx_normal
-            yz = cartesian_root.yz_normal
-
-            # origin + x_offset = outer_self.base.unit_length - inner_self.depth_clearance - inner_self.dish_inset
-
-            # use diagonals as further caching attributes
-            tl = inner_self._to_vertex(basis_face.vertices("<{X} and >{Y}".format(X=x_str, Y=y_str)).val())
-            tr = inner_self._to_vertex(basis_face.vertices(">{X} and >{Y}".format(X=x_str, Y=y_str)).val())
-            bl = inner_self._to_vertex(basis_face.vertices("<{X}".format(X=x_str)).val())
-            br = inner_self._to_vertex(basis_face.vertices(">{X} and <{Y}".format(X=x_str, Y=y_str)).val())
-            diag1 = math.dist([tl.X, tl.Y], [br.X, br.Y])
-            diag2 = math.dist([tr.X, tr.Y], [bl.X, bl.Y])
-
-            cached = cache.get("slot", str(diag1), str(diag2), str(do_fill))
-
-            if cached is None:
-                anchor_edge = basis_face.edges(">{X} and |{Y}".format(X=x_str, Y=y_str)).val()  # type: cadquery.Edge
-                z_offset = - cadquery.Shape.centerOfMass(anchor_edge).z
-
-                skin = cadquery.Workplane().sketch() \
-                    .face(basis_face.edges().vals()).faces("<{Z}".format(Z=z_str)) \
-                    .finalize() \
-                    .extrude(-inner_self.thickness) \
-                    .translate((0, 0, z_offset))
-
-                if do_fill:
-                    self._cad_object = skin
-                else:
-                    slot = cadquery.Workplane() \
-                        .box(inner_self.slot_width, inner_self.slot_depth, inner_self.thickness) \
-                        .translate((0, 0, -inner_self.thickness / 2))
-
-                    undercut_front = cadquery.Workplane() \
-                        .box(inner_self.undercut_width, inner_self.undercut_depth, inner_self.thickness) \
-                        .translate((0, -inner_self.slot_depth / 2 - inner_self.undercut_depth / 2, -inner_self.undercut_thickness - inner_self.thickness / 2))
-                    undercut_back = undercut_front.mirror(xz)
-                    undercut_left = cadquery.Workplane() \
-                        .box(inner_self.undercut_depth, inner_self.undercut_width, inner_self.thickness) \
-                        .translate((-inner_self.slot_width / 2 - inner_self.undercut_depth / 2, 0, -inner_self.undercut_thickness - inner_self.thickness / 2))
-                    undercut_right = undercut_left.mirror(yz)
-                    undercuts = undercut_front.union(undercut_right).union(undercut_back).union(undercut_left)
-
-                    inner_self._cad_object = skin.cut(slot).cut(undercuts)
-
-                cache.store(inner_self._cad_object, "slot", str(diag1), str(diag2), str(do_fill))
-            else:
-                inner_self._cad_object = cache.get("slot", str(diag1), str(diag2), str(do_fill))
-
-        self.slot.compute = MethodType(key_slot_compute, self.slot)
-        self.cap.compute = MethodType(key_cap_compute, self.cap)
-
 
 class IsoNumpadEnterKey(Key100Unit):
     """
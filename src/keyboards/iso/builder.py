@@ -18,9 +18,14 @@ def compute(**kwargs) -> List[List[Key]]:
       6. construct bottom plate (not yet supported)
       ...
       n. clean up cad objects that shall not be rendered
+
+    partitioned build: if a partition is given (see: DactylKey.partition) only the connectors attached to its keys are constructed;
+    cad objects are computed for its keys plus the neighbour keys of other partitions the connectors at the seam need
+    (see: get_partition_key_indices), all other keys are placed only
     """
 
     do_unify = kwargs.get('do_unify', False)
+    partition = kwargs.get('partition', None)
 
     # 1.
     key_matrix = build_key_matrix()
@@ -30,14 +35,14 @@ def compute(**kwargs) -> List[List[Key]]:
     apply_translation_offset(key_matrix)
 
     # 3.
-    compute_placement_and_cad_objects(key_matrix)
+    face_conn_map = get_key_face_connection_mapping(key_matrix)
+    compute_placement_and_cad_objects(key_matrix, get_partition_key_indices(key_matrix, face_conn_map, partition) if partition is not None else None)
 
     # 4.
-    conn_map = get_key_face_connection_mapping(key_matrix)
-    KeyUtils.connect_keys_face(key_matrix, conn_map)
+    KeyUtils.connect_keys_face(key_matrix, face_conn_map, partition)
 
-    conn_map = get_key_corner_edge_connection_mapping(key_matrix)
-    KeyUtils.connect_key_corner_edges(key_matrix, conn_map)
+    conn_map = get_key_corner_edge_connection_mapping(key_matrix, partition)
+    KeyUtils.connect_key_corner_edges(key_matrix, conn_map, partition)
 
     # n.
     KeyUtils.filter_cad_objects(key_matrix, remove_non_solids=do_unify)
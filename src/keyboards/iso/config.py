@@ -116,6 +116,20 @@ class GroupConfig(object):
         self.clearance_x_numpad = 10  # type: float
 
 
+class BoardConfig(object):
+    def __init__(self):
+        """
+        Board-level transformation applied once to the squashed result (see: keys/board.py).
+        The key placement is not altered, thus cached key components and connector templates are re-used.
+
+        self.tilt : rotation in [deg] around the board's front edge (x-axis); positive raises the back
+        self.tent : rotation in [deg] of each hand around its outer edge (y-axis); positive raises the inner edges,
+                    left and right hand are squashed separately then
+        """
+        self.tilt = 0  # type: float
+        self.tent = 0  # type: float
+
+
 class MatrixConfig(object):
     def __init__(self):
         # defined after command line arguments are parsed
@@ -134,6 +148,7 @@ class _ModelConfig(object):
     switch = KeySwitchConfig()
     switch_slot = KeySwitchSlotConfig()
     group = GroupConfig()
+    board = BoardConfig()
     matrix = MatrixConfig()
 
 
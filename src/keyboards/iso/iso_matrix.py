@@ -1,14 +1,19 @@
+from typing import Set
+
 from cadquery import NearestToPointSelector
 
 from src.iso_keys.keys import *
 from src.cli_args import cli_args
 from src.keys.canonical_keys import Key100UnitSpacerConnected, Key100UnitSpacerFilled, Key125UnitSpacer
 from src.keys.key import Key
-from src.keys.key_mixins import Direction
+from src.keys.key_mixins import Direction, KeyPlane
+from src.keys.geometry import KeyGeometryTable
+from src.keys.placement import PlacementTable
+from src.keys.parallel import compute_cad_objects, effective_jobs
+from src.cfg.perf import PERF
 from src.keyboard_size import KeyboardSize
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-from src.keys.utils import KeyUtils
 
 
 def build_key_row_0(size: KeyboardSize) -> List[Key]:
@@ -323,46 +328,42 @@ def apply_orientation_offset(key_matrix: List[List[Key]]) -> None:
                 continue
                 # TODO rubienr - prototyping
                 key.base.rotation_offset = tuple(map(operator.add, key.base.rotation_offset, (5, 5, 5)))
-                key.base.compute_relative_cardinal_rotation()
             key_idx += 1
         key_idx = 0
         row_idx += 1
 
-    pass
+    # relative axes of all keys at once
+    KeyPlane.compute_relative_cardinal_rotations([key.base for row in key_matrix for key in row])
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
-def compute_placement_and_cad_objects(key_matrix: List[List[Key]]) -> None:
+def compute_placement_and_cad_objects(key_matrix: List[List[Key]], selected: Optional[Set[Tuple[int, int]]] = None) -> None:
+    """
+    @param selected: (row, column) of the keys to compute cad objects for, None for all (see: get_partition_key_indices);
+                     the placement is computed for all keys
+    """
     print("compute key placement and cad objects ...")
-    last_row = None
-    last_key = None
+
+    # update/resolve input parameters dependencies
+    for row in key_matrix:
+        for key in row:
+            key.update()
+
+    # compute planar key placement in ISO style for all keys at once
+    placement = PlacementTable(key_matrix)
+    placement.solve()
+    placement.apply()
+
     row_idx = 0
     for row in key_matrix:
         print("row {}".format(row_idx))
         print("  col│position x   position y   position z  │rotation x   rotation y   rotation z  |key   unit│clrto clrri clrbo clrle│capwi  capde capth│vis|dactyl")
         print("  ───┼──────────────────────────────────────┼──────────────────────────────────────┼──────────┼───────────────────────┼──────────────────┼───┼──────")
-        is_first_key_in_row = True
         col_idx = 0
 
         for key in row:
-            # update/resolve input parameters dependencies
-            key.update()
-
-            # compute planar key placement in ISO style
-            if is_first_key_in_row:
-                if last_row is not None:
-                    KeyUtils.set_position_relative_to(key.base, last_row[0].base, Direction.TOP)
-                key.base.align_to_position(0, Direction.LEFT)
-            elif last_key is not None:
-                KeyUtils.set_position_relative_to(key.base, last_key.base, Direction.RIGHT)
-            is_first_key_in_row = False
-            last_key = key
-
-            # compute placement and cad components of the key
-            key.compute()
-
             print("  {col:2} "
                   "│{x:6.2f}{x_off:+6.2f} {y:6.2f}{y_off:+6.2f} {z:6.2f}{z_off:+6.2f}"
                   "|{rot_x:6.2f}{rot_x_off:+6.2f} {rot_y:6.2f}{rot_y_off:+6.2f} {rot_z:6.2f}{rot_z_off:+6.2f}"
@@ -393,8 +394,12 @@ def compute_placement_and_cad_objects(key_matrix: List[List[Key]]) -> None:
                                  + (" key" if not key.dactyl.is_numpad_block and not key.dactyl.is_arrow_block else "")))
 
             col_idx = col_idx + 1
-        last_row = row
         row_idx = row_idx + 1
+
+    # the placement is final: compute cad components of all keys (optionally in parallel)
+    print("compute cad objects ({} of {} keys, {} jobs) ...".format(
+        sum(len(row) for row in key_matrix) if selected is None else len(selected), sum(len(row) for row in key_matrix), effective_jobs(PERF.jobs)))
+    compute_cad_objects(key_matrix, PERF.jobs, selected)
     print("compute key placement and cad objects: done")
 
 
@@ -424,7 +429,7 @@ def compute_placement_and_cad_objects(key_matrix: List[List[Key]]) -> None:
 def get_key_face_connection_mapping(key_matrix: List[List[Key]]) -> List[Tuple[int, int, Direction, int, int, Direction, bool]]:
     """
     Specifies which keys and which keys' face are to be connected.
-    @param key_matrix: pool of keys with pre-computed placement and cad objects
+    @param key_matrix: pool of keys; only the matrix layout is used, thus placement and cad objects need not be computed yet
     """
 
     print("compute key face connection mapping ...")
@@ -504,10 +509,26 @@ def get_key_face_connection_mapping(key_matrix: List[List[Key]]) -> List[Tuple[i
     return result
 
 
+def get_partition_key_indices(key_matrix: List[List[Key]],
+                              face_connections: List[Tuple[int, int, Direction, int, int, Direction, bool]],
+                              partition: str) -> Set[Tuple[int, int]]:
+    """
+    The keys a partitioned build computes cad objects for: the keys of the partition plus the one ring of neighbour keys
+    whose slot faces the seam connectors are resolved from. Corner-edge fillers need the key placement only (see: KeyGeometryTable).
+    @param face_connections: see: get_key_face_connection_mapping
+    @param partition: see: DactylKey.partition
+    @return: (row, column) of the keys
+    """
+    result = {(row_idx, col_idx) for row_idx, row in enumerate(key_matrix) for col_idx, key in enumerate(row) if key.dactyl.partition == partition}
+    result.update((b_row, b_col) for a_row, a_col, _, b_row, b_col, _, _ in face_connections if key_matrix[a_row][a_col].dactyl.partition == partition)
+    return result
+
+
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
-def _get_key_intersection_gap_filler_edges(key_matrix: List[List[Key]], bottom_left_row_idx: int, bottom_left_key_idx: int, top_left_key_idx: int) -> List[Tuple[cadquery.Vector, cadquery.Vector]]:
+def _get_key_intersection_gap_filler_edges(key_matrix: List[List[Key]], geometry: KeyGeometryTable,
+                                           bottom_left_row_idx: int, bottom_left_key_idx: int, top_left_key_idx: int) -> List[Tuple[cadquery.Vector, cadquery.Vector]]:
     """
         top left key index
         ↓
@@ -522,22 +543,25 @@ def _get_key_intersection_gap_filler_edges(key_matrix: List[List[Key]], bottom_l
     """
     result = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
     tl = key_matrix[bottom_left_row_idx][bottom_left_key_idx]
-    result.append(tl.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, tl.base.relative_cartesian))
+    result.append(geometry.corner_edge(tl, Direction.RIGHT, Direction.BACK))
 
     tr = key_matrix[bottom_left_row_idx][bottom_left_key_idx + 1]
-    result.append(tr.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, tr.base.relative_cartesian))
+    result.append(geometry.corner_edge(tr, Direction.LEFT, Direction.BACK))
 
     br = key_matrix[bottom_left_row_idx + 1][top_left_key_idx + 1]
-    result.append(br.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, br.base.relative_cartesian))
+    result.append(geometry.corner_edge(br, Direction.LEFT, Direction.FRONT))
 
     bl = key_matrix[bottom_left_row_idx + 1][top_left_key_idx]
-    result.append(bl.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, bl.base.relative_cartesian))
+    result.append(geometry.corner_edge(bl, Direction.RIGHT, Direction.FRONT))
 
     return result
 
 
-def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[Tuple[int, int, List[Tuple[cadquery.Vector, cadquery.Vector]], Direction, bool]]:
+def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]],
+                                           partition: Optional[str] = None) -> List[Tuple[int, int, List[Tuple[cadquery.Vector, cadquery.Vector]], Direction, bool]]:
     """
+    @param partition: skips the iso enter filling unless the enter key belongs to this partition (see: DactylKey.partition);
+                      it selects from a key to key connector which is built only within the enter key's partition
     @return a list of tuples containing
         - the key index where to attach the connector,
         - a list of tuples (edges) of two vertex
@@ -547,6 +571,9 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
 
     print("compute key corner-edge connection mapping ...")
 
+    # corner edges are computed from the key placement in one pass rather than selected from the solids
+    geometry = KeyGeometryTable(key_matrix)
+
     polyhedron_mode = True
     result = list()  # type: List[Tuple[int, int, List[Tuple[cadquery.Vector, cadquery.Vector]], Direction, bool]]
 
@@ -565,47 +592,47 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
 
         row_idx = 0
         for key_idx in range(0, 3):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(3, 6):
-            result.append((row_idx + 1, key_idx + 6, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 6), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 6, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 6), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(7, 11):
-            result.append((row_idx + 1, key_idx + 5, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 5), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 5, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 5), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(11, 12):
-            result.append((row_idx + 1, key_idx + 6, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 6), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 6, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 6), Direction.FRONT_RIGHT, polyhedron_mode))
 
         # row 1 to 2
 
         row_idx = 1
         for key_idx in range(0, 12):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(12, 18):
-            result.append((row_idx + 1, key_idx + 1, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 1), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 1, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 1), Direction.FRONT_RIGHT, polyhedron_mode))
 
         # row 2 to 3
 
         row_idx = 2
         for key_idx in range(0, 12):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(14, 19):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
 
         # row 3 to 4
 
         row_idx = 3
         for key_idx in range(0, 20):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
 
         # row 4 to 5
 
         row_idx = 4
         for key_idx in range(0, 1):
-            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx + 0, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx + 0), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(2, 9):
-            result.append((row_idx + 1, key_idx - 1, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx - 1), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx - 1, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx - 1), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(10, 13):
-            result.append((row_idx + 1, key_idx - 2, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx - 2), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx - 2, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx - 2), Direction.FRONT_RIGHT, polyhedron_mode))
         for key_idx in range(13, 20):
-            result.append((row_idx + 1, key_idx - 1, _get_key_intersection_gap_filler_edges(key_matrix, row_idx, key_idx, key_idx - 1), Direction.FRONT_RIGHT, polyhedron_mode))
+            result.append((row_idx + 1, key_idx - 1, _get_key_intersection_gap_filler_edges(key_matrix, geometry, row_idx, key_idx, key_idx - 1), Direction.FRONT_RIGHT, polyhedron_mode))
 
     intersection_filling()
 
@@ -635,20 +662,20 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
             for key_idx in keys_idx:
                 key = key_matrix[row_idx][key_idx]
                 if (not key_idx == last_key_idx and spc_x_direction == Direction.RIGHT) or spc_x_direction == Direction.LEFT:
-                    gap_filler.append(key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, key.base.relative_cartesian))
+                    gap_filler.append(geometry.corner_edge(key, Direction.LEFT, Direction.FRONT))
                 if (not key_idx == last_key_idx and spc_x_direction == Direction.LEFT) or spc_x_direction == Direction.RIGHT:
-                    gap_filler.append(key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, key.base.relative_cartesian))
-                gap_filler.append(spc_key.slot.get_cad_corner_edge(spc_x_direction, Direction.BACK, spc_key.base.relative_cartesian))
+                    gap_filler.append(geometry.corner_edge(key, Direction.RIGHT, Direction.FRONT))
+                gap_filler.append(geometry.corner_edge(spc_key, spc_x_direction, Direction.BACK))
             return gap_filler
 
         result.append((0, 3, helper([3, 4, 5, 6], Direction.LEFT), Direction.BACK_LEFT, polyhedron_mode))
         result.append((0, 3, helper([9, 8, 7, 6], Direction.RIGHT), Direction.BACK_RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(b_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, b_key.base.relative_cartesian))
-        gap_filler.append(b_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, b_key.base.relative_cartesian))
-        gap_filler.append(spc_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, spc_key.base.relative_cartesian))
-        gap_filler.append(spc_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, spc_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(b_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(b_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(spc_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(spc_key, Direction.LEFT, Direction.BACK))
         result.append((0, 3, gap_filler, Direction.BACK, polyhedron_mode))
 
     vertical_spc_gap_filler()
@@ -660,15 +687,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         rsft_key = key_matrix[1][12]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(rctl_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, rctl_key.base.relative_cartesian))
-        gap_filler.append(rctl_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, rctl_key.base.relative_cartesian))
-        gap_filler.append(rsft_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, rsft_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(rctl_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(rctl_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(rsft_key, Direction.RIGHT, Direction.FRONT))
         result.append((0, 7, gap_filler, Direction.BACK, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(menu_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, menu_key.base.relative_cartesian))
-        gap_filler.append(rctl_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, rctl_key.base.relative_cartesian))
-        gap_filler.append(rsft_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, rsft_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(menu_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(rctl_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(rsft_key, Direction.RIGHT, Direction.FRONT))
         result.append((0, 6, gap_filler, Direction.BACK_RIGHT, polyhedron_mode))
 
     rctl_rsft_triangle()
@@ -681,15 +708,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         nins_key = key_matrix[0][11]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np1_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np1_key.base.relative_cartesian))
-        gap_filler.append(np2_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, np2_key.base.relative_cartesian))
-        gap_filler.append(nins_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, nins_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np1_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np2_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nins_key, Direction.RIGHT, Direction.BACK))
         result.append((1, 16, gap_filler, Direction.FRONT_RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np2_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, np2_key.base.relative_cartesian))
-        gap_filler.append(np2_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np2_key.base.relative_cartesian))
-        gap_filler.append(nins_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, nins_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np2_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np2_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nins_key, Direction.RIGHT, Direction.BACK))
         result.append((1, 17, gap_filler, Direction.FRONT, polyhedron_mode))
 
     numpad_mins_triangle()
@@ -702,15 +729,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         num2_key = key_matrix[4][2]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(f1_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f1_key.base.relative_cartesian))
-        gap_filler.append(num2_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, num2_key.base.relative_cartesian))
-        gap_filler.append(num2_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, num2_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(f1_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(num2_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(num2_key, Direction.LEFT, Direction.BACK))
         result.append((4, 2, gap_filler, Direction.BACK, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(num1_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, num1_key.base.relative_cartesian))
-        gap_filler.append(num2_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, num2_key.base.relative_cartesian))
-        gap_filler.append(f1_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f1_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(num1_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(num2_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(f1_key, Direction.RIGHT, Direction.FRONT))
         result.append((4, 1, gap_filler, Direction.BACK_RIGHT, polyhedron_mode))
 
         # triangle in between F8, F9 and 0
@@ -720,15 +747,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         num0_key = key_matrix[4][10]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(f8_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f8_key.base.relative_cartesian))
-        gap_filler.append(num0_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, num0_key.base.relative_cartesian))
-        gap_filler.append(num0_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, num0_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(f8_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(num0_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(num0_key, Direction.LEFT, Direction.BACK))
         result.append((4, 10, gap_filler, Direction.BACK, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(num9_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, num9_key.base.relative_cartesian))
-        gap_filler.append(num0_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, num0_key.base.relative_cartesian))
-        gap_filler.append(f8_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f8_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(num9_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(num0_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(f8_key, Direction.RIGHT, Direction.FRONT))
         result.append((4, 9, gap_filler, Direction.BACK_RIGHT, polyhedron_mode))
 
         # triangle in between F11, F12 and BSP
@@ -738,15 +765,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         bsp_key = key_matrix[4][13]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(f12_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, f12_key.base.relative_cartesian))
-        gap_filler.append(f12_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f12_key.base.relative_cartesian))
-        gap_filler.append(bsp_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bsp_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(f12_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(f12_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bsp_key, Direction.RIGHT, Direction.BACK))
         result.append((5, 12, gap_filler, Direction.FRONT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(f11_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, f11_key.base.relative_cartesian))
-        gap_filler.append(f12_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, f12_key.base.relative_cartesian))
-        gap_filler.append(bsp_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bsp_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(f11_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(f12_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bsp_key, Direction.RIGHT, Direction.BACK))
         result.append((5, 11, gap_filler, Direction.FRONT_RIGHT, polyhedron_mode))
 
     frow_numrow_tirangles()
@@ -777,8 +804,8 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         e = bottom_left_key.connectors.right.get_cad_face(Direction.BACK, bottom_left_key.base.relative_cartesian).edges("|Z").edges(">X")
         gap_filler.append((e.vertices("<Z").val().Center(), e.vertices(">Z").val().Center()))
 
-        gap_filler.append(bottom_left_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bottom_left_key.base.relative_cartesian))
-        gap_filler.append(left_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, left_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(bottom_left_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(left_key, Direction.RIGHT, Direction.FRONT))
 
         result.append((3, 12, gap_filler, Direction.FRONT_RIGHT, polyhedron_mode))
 
@@ -786,15 +813,15 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         bottom_key = key_matrix[1][12]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(bottom_left_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, bottom_left_key.base.relative_cartesian))
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, enter_key.base.relative_cartesian))
-        gap_filler.append(bottom_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bottom_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(bottom_left_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bottom_key, Direction.RIGHT, Direction.BACK))
         result.append((3, 13, gap_filler, Direction.FRONT_LEFT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, enter_key.base.relative_cartesian))
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, enter_key.base.relative_cartesian))
-        gap_filler.append(bottom_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bottom_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bottom_key, Direction.RIGHT, Direction.BACK))
         result.append((3, 13, gap_filler, Direction.FRONT, polyhedron_mode))
 
         # right connector
@@ -803,22 +830,23 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         bottom_key_right_spacer = key_matrix[1][13]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, enter_key.base.relative_cartesian))
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, enter_key.base.relative_cartesian))
-        gap_filler.append(top_right_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, top_right_key.base.relative_cartesian))
-        gap_filler.append(top_right_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, top_right_key.base.relative_cartesian))
-        gap_filler.append(bottom_right_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, bottom_right_key.base.relative_cartesian))
-        gap_filler.append(bottom_right_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, bottom_right_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(top_right_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(top_right_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bottom_right_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(bottom_right_key, Direction.LEFT, Direction.FRONT))
         result.append((3, 13, gap_filler, Direction.RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(enter_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, enter_key.base.relative_cartesian))
-        gap_filler.append(bottom_right_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, bottom_right_key.base.relative_cartesian))
-        gap_filler.append(bottom_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, bottom_key.base.relative_cartesian))
-        gap_filler.append(bottom_key_right_spacer.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, bottom_key_right_spacer.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(enter_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bottom_right_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(bottom_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(bottom_key_right_spacer, Direction.LEFT, Direction.BACK))
         result.append((3, 13, gap_filler, Direction.FRONT_RIGHT, polyhedron_mode))
 
-    iso_enter_filling()
+    if partition is None or key_matrix[3][13].dactyl.partition == partition:
+        iso_enter_filling()
 
     def nent_ndel_connectors():
         # horizontal gap in between numpad 3, NDEL and NENT
@@ -828,22 +856,22 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         nent_key = key_matrix[1][len(key_matrix[1]) - 1]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np3_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np3_key.base.relative_cartesian))
-        gap_filler.append(np3_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, np3_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nent_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np3_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np3_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.BACK))
         result.append((1, len(key_matrix[1]) - 2, gap_filler, Direction.RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np3_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np3_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nent_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nent_key.base.relative_cartesian))
-        gap_filler.append(ndel_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, ndel_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np3_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(ndel_key, Direction.RIGHT, Direction.BACK))
         result.append((0, len(key_matrix[0]) - 2, gap_filler, Direction.BACK_RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nent_key.base.relative_cartesian))
-        gap_filler.append(ndel_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, ndel_key.base.relative_cartesian))
-        gap_filler.append(ndel_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, ndel_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(ndel_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(ndel_key, Direction.RIGHT, Direction.BACK))
         result.append((0, len(key_matrix[0]) - 2, gap_filler, Direction.RIGHT, polyhedron_mode))
 
         # horizontal gap in between numpad 9, numpad 6 and NPLU
@@ -853,40 +881,40 @@ def get_key_corner_edge_connection_mapping(key_matrix: List[List[Key]]) -> List[
         np6_key = key_matrix[2][len(key_matrix[2]) - 2]
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np9_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np9_key.base.relative_cartesian))
-        gap_filler.append(np9_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, np9_key.base.relative_cartesian))
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nplu_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np9_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np9_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.BACK))
         result.append((3, len(key_matrix[3]) - 2, gap_filler, Direction.RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np9_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np9_key.base.relative_cartesian))
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nplu_key.base.relative_cartesian))
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nplu_key.base.relative_cartesian))
-        gap_filler.append(np6_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, np6_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np9_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np6_key, Direction.RIGHT, Direction.BACK))
         result.append((2, len(key_matrix[2]) - 2, gap_filler, Direction.BACK_RIGHT, polyhedron_mode))
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nplu_key.base.relative_cartesian))
-        gap_filler.append(np6_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np6_key.base.relative_cartesian))
-        gap_filler.append(np6_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, np6_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np6_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np6_key, Direction.RIGHT, Direction.BACK))
         result.append((2, len(key_matrix[2]) - 2, gap_filler, Direction.RIGHT, polyhedron_mode))
 
         # intersection in between numpad 6, numpad 3, NPLU and NENT
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(np6_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, np6_key.base.relative_cartesian))
-        gap_filler.append(np3_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, np3_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nent_key.base.relative_cartesian))
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nplu_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(np6_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(np3_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.FRONT))
         result.append((2, len(key_matrix[2]) - 2, gap_filler, Direction.FRONT_RIGHT, polyhedron_mode))
 
         # vertical gap in between NPLU and NENT
 
         gap_filler = list()  # type: List[Tuple[cadquery.Vector, cadquery.Vector]]
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.FRONT, nplu_key.base.relative_cartesian))
-        gap_filler.append(nplu_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.FRONT, nplu_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.RIGHT, Direction.BACK, nent_key.base.relative_cartesian))
-        gap_filler.append(nent_key.slot.get_cad_corner_edge(Direction.LEFT, Direction.BACK, nent_key.base.relative_cartesian))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.LEFT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nplu_key, Direction.RIGHT, Direction.FRONT))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.RIGHT, Direction.BACK))
+        gap_filler.append(geometry.corner_edge(nent_key, Direction.LEFT, Direction.BACK))
         result.append((3, len(key_matrix[3]) - 1, gap_filler, Direction.FRONT, polyhedron_mode))
 
     nent_ndel_connectors()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import cadquery
+import numpy
+from OCP.gp import gp_Ax1, gp_Dir, gp_Pnt, gp_Trsf
+
+from .geometry import KeyGeometryTable
+from src import model_importer
+
+if TYPE_CHECKING:
+    from .key import Key
+
+_cliargs, config = model_importer.import_config()
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def board_side(key: Key) -> str:
+    """
+    @return: "left" or "right"; arrow and numpad block belong to the hand they are flagged with (see: DactylKey)
+    """
+    return "left" if key.dactyl.is_left_hand else "right"
+
+
+def _rotation(point: Tuple[float, float, float], axis: Tuple[float, float, float], angle: float) -> gp_Trsf:
+    transformation = gp_Trsf()
+    transformation.SetRotation(gp_Ax1(gp_Pnt(*point), gp_Dir(*axis)), math.radians(angle))
+    return transformation
+
+
+class BoardTransform(object):
+    """
+    Board-level tilt and tent (see: BoardConfig) as one location per side, applied once to the squashed result (see: KeyUtils.squash).
+    The keys' placement is not altered, thus cached key components and connector templates are the same as for a flat board.
+
+    The pivots follow from the slot corners of all keys:
+      - tent: each side rotates around the y-axis through its outer bottom edge, the inner edges rise
+      - tilt: the tented sides rotate around the x-axis through the board's front bottom edge, the back rises
+    Without tent the board is one side ("board"), otherwise left and right hand are separate sides.
+    """
+
+    def __init__(self, key_matrix: List[List[Key]]):
+        # the board configuration is optional, the same guard as of the --tilt/--tent arguments (see: import_config)
+        board = getattr(config.MODEL_CONFIG, "board", None)
+        self.tilt = board.tilt if board is not None else 0  # type: float
+        self.tent = board.tent if board is not None else 0  # type: float
+        self.locations = dict()  # type: Dict[str, cadquery.Location]
+        if not self.is_active:
+            return
+
+        keys = [key for row in key_matrix for key in row]  # type: List[Key]
+        corners = KeyGeometryTable(key_matrix).slot_corners.reshape(len(keys), -1, 3)
+        lower, upper = corners.min(axis=(0, 1)), corners.max(axis=(0, 1))
+        tilt = _rotation((0.0, float(lower[1]), float(lower[2])), (1, 0, 0), self.tilt)
+
+        if self.tent == 0:
+            self.locations["board"] = cadquery.Location(tilt)
+            return
+        for side, sign in (("left", -1), ("right", 1)):
+            side_corners = corners[numpy.array([board_side(key) == side for key in keys])]
+            if len(side_corners) < 1:
+                continue
+            outer_x = side_corners[..., 0].min() if side == "left" else side_corners[..., 0].max()
+            tent = _rotation((float(outer_x), 0.0, float(lower[2])), (0, 1, 0), sign * self.tent)
+            self.locations[side] = cadquery.Location(tilt.Multiplied(tent))
+
+    @property
+    def is_active(self) -> bool:
+        return self.tilt != 0 or self.tent != 0
+
+    def side(self, key: Key) -> str:
+        """
+        @return: the side the key is squashed with: "board" without tent, otherwise its hand
+        """
+        return "board" if self.tent == 0 else board_side(key)
+
+    def location(self, side: str) -> cadquery.Location:
+        return self.locations[side] if self.is_active else cadquery.Location()
+
+    def summary(self) -> str:
+        return "tilt: {}°, tent: {}°".format(self.tilt, self.tent) if self.is_active else "none"
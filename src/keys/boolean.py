@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import List, Tuple
+
+import cadquery
+from OCP.BOPAlgo import BOPAlgo_GlueEnum
+from OCP.BRepAlgoAPI import BRepAlgoAPI_BooleanOperation, BRepAlgoAPI_Fuse, BRepAlgoAPI_Cut
+from OCP.TopTools import TopTools_ListOfShape
+
+from src.cfg.perf import PERF
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class BooleanStatistics(object):
+    """
+    Number and accumulated wall time of the boolean operations run by this module.
+    """
+
+    def __init__(self):
+        self.operations = 0  # type: int
+        self.seconds = 0.0  # type: float
+
+    def counters(self) -> Tuple[int, float]:
+        return self.operations, self.seconds
+
+    def add_counters(self, before: Tuple[int, float], after: Tuple[int, float]) -> None:
+        """
+        Adds the operations done meanwhile by another process (see: counters).
+        """
+        self.operations += after[0] - before[0]
+        self.seconds += after[1] - before[1]
+
+
+BOOLEAN_STATISTICS = BooleanStatistics()
+
+
+def options_summary() -> str:
+    if not PERF.boolean_options:
+        return "none"
+    return "parallel: {}, fuzzy value: {}, obb: {}, non-destructive: {}".format(
+        "yes" if PERF.boolean_parallel else "no", PERF.boolean_fuzzy_value,
+        "yes" if PERF.boolean_use_obb else "no", "yes" if PERF.boolean_non_destructive else "no")
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def boolean_operation(operation: BRepAlgoAPI_BooleanOperation, args: List[cadquery.Shape], tools: List[cadquery.Shape]) -> cadquery.Shape:
+    """
+    Runs the boolean operation with the options of PerfConfig (boolean_*).
+    Without options OCCT's defaults apply except for parallel mode, which cadquery always enables.
+    """
+    arg_list = TopTools_ListOfShape()
+    for shape in args:
+        arg_list.Append(shape.wrapped)
+    tool_list = TopTools_ListOfShape()
+    for shape in tools:
+        tool_list.Append(shape.wrapped)
+
+    operation.SetArguments(arg_list)
+    operation.SetTools(tool_list)
+    if PERF.boolean_options:
+        operation.SetRunParallel(PERF.boolean_parallel)
+        operation.SetUseOBB(PERF.boolean_use_obb)
+        operation.SetNonDestructive(PERF.boolean_non_destructive)
+        if PERF.boolean_fuzzy_value > 0:
+            operation.SetFuzzyValue(PERF.boolean_fuzzy_value)
+    else:
+        operation.SetRunParallel(True)
+
+    begin = perf_counter()
+    operation.Build()
+    BOOLEAN_STATISTICS.operations += 1
+    BOOLEAN_STATISTICS.seconds += perf_counter() - begin
+    return cadquery.Shape.cast(operation.Shape())
+
+
+def fuse_shapes(shapes: List[cadquery.Shape], glue: bool = False) -> cadquery.Shape:
+    """
+    Fuses all shapes by one boolean operation.
+    @param glue: faster fuse of shapes sharing faces but not overlapping (see: PerfConfig.glue_mode)
+    """
+    if len(shapes) == 1:
+        return shapes[0]
+    operation = BRepAlgoAPI_Fuse()
+    if glue:
+        operation.SetGlue(BOPAlgo_GlueEnum.BOPAlgo_GlueFull if PERF.glue_mode == "full" else BOPAlgo_GlueEnum.BOPAlgo_GlueShift)
+    return boolean_operation(operation, shapes[:1], shapes[1:])
+
+
+def cut_shapes(shape: cadquery.Shape, tools: List[cadquery.Shape]) -> cadquery.Shape:
+    return boolean_operation(BRepAlgoAPI_Cut(), [shape], tools)
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def union(obj: cadquery.Workplane, to_union: cadquery.Workplane, clean: bool = True) -> cadquery.Workplane:
+    """
+    Replacement of cadquery.Workplane.union(): unions the solids of to_union with the solid of obj if any, otherwise with each other.
+    """
+    shapes = to_union.solids().vals()  # type: List[cadquery.Shape]
+    if len(shapes) < 1:
+        raise ValueError("Workplane object must have at least one solid on the stack to union!")
+    try:
+        shapes.insert(0, obj.findSolid())
+    except ValueError:
+        pass
+    result = fuse_shapes(shapes)
+    return obj.newObject([result.clean() if clean else result])
+
+
+def cut(obj: cadquery.Workplane, to_cut: cadquery.Workplane, clean: bool = True) -> cadquery.Workplane:
+    """
+    Replacement of cadquery.Workplane.cut(): cuts the objects of to_cut from the solid of obj.
+    """
+    result = cut_shapes(obj.findSolid(), [v for v in to_cut.vals() if isinstance(v, cadquery.Shape)])
+    return obj.newObject([result.clean() if clean else result])
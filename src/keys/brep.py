@@ -0,0 +1,50 @@
+from io import BytesIO
+from typing import List, BinaryIO
+
+import cadquery
+from OCP.BinTools import BinTools
+from OCP.TopoDS import TopoDS_Shape, TopoDS_Iterator
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def write_workplane(obj: cadquery.Workplane, stream: BinaryIO) -> None:
+    """
+    Serializes all shapes on the workplane stack to binary BREP.
+    The shapes are packed into one compound so that the stack can be restored in the same order.
+    """
+    shapes = [v for v in obj.vals() if isinstance(v, cadquery.Shape)]  # type: List[cadquery.Shape]
+    BinTools.Write_s(cadquery.Compound.makeCompound(shapes).wrapped, stream)
+
+
+def read_workplane(stream: BinaryIO) -> cadquery.Workplane:
+    """
+    Restores a workplane serialized by write_workplane().
+    The stream must provide read(); BinTools reads the whole stream at once.
+    """
+    compound = TopoDS_Shape()
+    BinTools.Read_s(compound, stream)
+
+    shapes = list()  # type: List[cadquery.Shape]
+    iterator = TopoDS_Iterator(compound)
+    while iterator.More():
+        shapes.append(cadquery.Shape.cast(iterator.Value()))
+        iterator.Next()
+    return cadquery.Workplane().add(shapes)
+
+
+def workplane_to_brep(obj: cadquery.Workplane) -> bytes:
+    """
+    Serializes all shapes on the workplane stack to binary BREP (see: write_workplane).
+    """
+    stream = BytesIO()
+    write_workplane(obj, stream)
+    return stream.getvalue()
+
+
+def workplane_from_brep(data: bytes) -> cadquery.Workplane:
+    """
+    Restores a workplane serialized by workplane_to_brep().
+    """
+    return read_workplane(BytesIO(data))
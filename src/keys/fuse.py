@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from typing import List, Tuple, Optional, Dict, Any
+
+import cadquery
+import numpy
+from OCP.ShapeUpgrade import ShapeUpgrade_UnifySameDomain
+
+from .brep import workplane_to_brep, workplane_from_brep
+from .parallel import process_pool, parallel_map, effective_jobs
+from .transport import send_shape, receive_shape
+from . import boolean
+from src.cfg.perf import PERF
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def union_solids(objs: List[cadquery.Workplane]) -> List[cadquery.Shape]:
+    """
+    @return: the solids to unify, in the same manner as boolean.union() collects them
+    @raise ValueError: if an object has no solid
+    """
+    solids = list()  # type: List[cadquery.Shape]
+    for obj in objs:
+        obj_solids = obj.solids().vals()
+        if len(obj_solids) < 1:
+            raise ValueError("Workplane object must have at least one solid on the stack to union!")
+        solids.extend(obj_solids)
+    return solids
+
+
+def unify_same_domain(shape: cadquery.Shape) -> cadquery.Shape:
+    """
+    One pass of ShapeUpgrade_UnifySameDomain: merges faces and edges lying on the same surface or curve,
+    same as cadquery.Shape.clean() does.
+    """
+    upgrader = ShapeUpgrade_UnifySameDomain(shape.wrapped, True, True, True)
+    upgrader.AllowInternalEdges(False)
+    upgrader.Build()
+    return cadquery.Shape.cast(upgrader.Shape())
+
+
+def _fuse_pair(first: cadquery.Shape, second: Optional[cadquery.Shape], clean: bool) -> cadquery.Shape:
+    if second is None:
+        return first
+    result = boolean.fuse_shapes([first, second])
+    return unify_same_domain(result) if clean else result
+
+
+def _fuse_pair_brep(args: Tuple[bytes, bool]) -> bytes:
+    """
+    Worker: fuses the pair of shapes serialized by workplane_to_brep(); returns the result for transport (see: send_shape).
+    """
+    data, clean = args
+    shapes = workplane_from_brep(data).vals()
+    return send_shape(cadquery.Workplane().add(_fuse_pair(shapes[0], shapes[1] if len(shapes) > 1 else None, clean)))
+
+
+def _pairs(shapes: List[cadquery.Shape]) -> List[Tuple[cadquery.Shape, Optional[cadquery.Shape]]]:
+    return [(shapes[i], shapes[i + 1] if i + 1 < len(shapes) else None) for i in range(0, len(shapes), 2)]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def fuse_sequential(objs: List[cadquery.Workplane], clean: bool) -> cadquery.Workplane:
+    """
+    Unifies the objects one after another into the accumulated union.
+    The accumulated union grows with each step, thus the total cost is about quadratic in the number of objects.
+    """
+    union = cadquery.Workplane()  # type: cadquery.Workplane
+    for obj in objs:
+        union = boolean.union(union, obj, clean=clean)
+    return union
+
+
+def fuse_tree(objs: List[cadquery.Workplane], clean: bool, jobs: int = 1) -> cadquery.Workplane:
+    """
+    Unifies the objects by a balanced tree reduction: neighbours are fused pairwise level by level until one shape is left.
+    Each boolean operation works on two operands of similar size; neighbours in key matrix order are close to each other,
+    thus intermediate results stay local and small.
+
+    @param jobs: number of worker processes fusing the pairs of a level (see: PerfConfig.jobs)
+    """
+    shapes = union_solids(objs)
+    if effective_jobs(jobs) <= 1:
+        while len(shapes) > 1:
+            shapes = [_fuse_pair(first, second, clean) for first, second in _pairs(shapes)]
+    else:
+        with process_pool(jobs) as executor:
+            while len(shapes) > 1:
+                pairs = [(workplane_to_brep(cadquery.Workplane().add([s for s in pair if s is not None])), clean) for pair in _pairs(shapes)]
+                shapes = [receive_shape(data).val() for data in executor.map(_fuse_pair_brep, pairs)]
+    return cadquery.Workplane().newObject(shapes[:1])
+
+
+def fuse_multi(objs: List[cadquery.Workplane], clean: bool) -> cadquery.Workplane:
+    """
+    Unifies the objects by a single boolean operation (BRepAlgoAPI_Fuse) with all objects as arguments.
+    """
+    shapes = union_solids(objs)
+    union = boolean.fuse_shapes(shapes)
+    return cadquery.Workplane().newObject([unify_same_domain(union) if clean else union])
+
+
+def bounding_boxes(shapes: List[cadquery.Shape], tolerance: float) -> numpy.ndarray:
+    """
+    @return: n × 6 array of the axis aligned bounding boxes (min x, y, z, max x, y, z), enlarged by the tolerance
+    """
+    boxes = numpy.empty((len(shapes), 6))
+    for i, shape in enumerate(shapes):
+        bb = shape.BoundingBox()
+        boxes[i] = (bb.xmin, bb.ymin, bb.zmin, bb.xmax, bb.ymax, bb.zmax)
+    boxes[:, :3] -= tolerance
+    boxes[:, 3:] += tolerance
+    return boxes
+
+
+def overlapping_pairs(boxes: numpy.ndarray) -> List[Tuple[int, int]]:
+    """
+    Candidate pairs are looked up by a uniform grid whose cell size is the largest median box extent:
+    each box is registered in all cells it covers and tested against the boxes sharing a cell only.
+
+    @param boxes: see: bounding_boxes()
+    @return: the index pairs (i < j) of overlapping boxes in ascending order
+    """
+    n = len(boxes)
+    cell_size = max(float(numpy.median(boxes[:, 3:] - boxes[:, :3], axis=0).max()), 1e-9) if n > 0 else 1.0
+    cells_min = numpy.floor(boxes[:, :3] / cell_size).astype(int)
+    cells_max = numpy.floor(boxes[:, 3:] / cell_size).astype(int)
+
+    grid = dict()  # type: Dict[Tuple[int, int, int], List[int]]
+    for i in range(n):
+        (x0, y0, z0), (x1, y1, z1) = cells_min[i], cells_max[i]
+        for cell in ((x, y, z) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1) for z in range(z0, z1 + 1)):
+            grid.setdefault(cell, list()).append(i)
+
+    pairs = set()
+    for members in grid.values():
+        if len(members) < 2:
+            continue
+        m = numpy.array(members)
+        lower, upper = boxes[m, :3], boxes[m, 3:]
+        overlaps = numpy.all((lower[:, None, :] <= upper[None, :, :]) & (lower[None, :, :] <= upper[:, None, :]), axis=2)
+        for a, b in zip(*numpy.nonzero(numpy.triu(overlaps, 1))):
+            pairs.add((int(m[a]), int(m[b])) if m[a] < m[b] else (int(m[b]), int(m[a])))
+    return sorted(pairs)
+
+
+def clusters(n: int, pairs: List[Tuple[int, int]]) -> List[List[int]]:
+    """
+    Groups the indices 0..n-1 into clusters of (transitively) connected pairs.
+    @return: the indices of each cluster in ascending order; clusters are ordered by their first index
+    """
+    parent = list(range(n))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in pairs:
+        parent[root(a)] = root(b)
+
+    result = dict()  # type: Dict[int, List[int]]
+    for i in range(n):
+        result.setdefault(root(i), list()).append(i)
+    return sorted(result.values(), key=lambda c: c[0])
+
+
+def overlap_clusters(boxes: numpy.ndarray) -> List[List[int]]:
+    """
+    Groups the boxes into clusters of (transitively) overlapping boxes (see: overlapping_pairs, clusters).
+    """
+    return clusters(len(boxes), overlapping_pairs(boxes))
+
+
+def fuse_clustered(objs: List[cadquery.Workplane], clean: bool, tolerance: float = 1e-3) -> cadquery.Workplane:
+    """
+    Fuses only solids whose bounding boxes (transitively) overlap, each cluster by one boolean operation.
+    Disjoint clusters (islands) are not fused but combined to a compound.
+
+    @param tolerance: bounding boxes are enlarged by this value in [mm], thus touching solids are fused
+    """
+    shapes = union_solids(objs)
+    islands = list()  # type: List[cadquery.Shape]
+    for cluster in overlap_clusters(bounding_boxes(shapes, tolerance)):
+        members = [shapes[i] for i in cluster]
+        island = boolean.fuse_shapes(members)
+        islands.append(unify_same_domain(island) if clean else island)
+    print("  {} solids in {} islands".format(len(shapes), len(islands)))
+    return cadquery.Workplane().newObject([islands[0] if len(islands) == 1 else cadquery.Compound.makeCompound(islands)])
+
+
+def is_glued(name: str) -> bool:
+    """
+    Slots and connectors are built to share faces with each other but not to overlap (see: Key.expose_cad_objects).
+    @param name: name of a squashed object (see: KeyUtils.squash_objects)
+    """
+    return name == "slot" or name.startswith("conn-")
+
+
+def fuse_glued(groups: List[List[Tuple[str, cadquery.Workplane]]], clean: bool, tolerance: float = 1e-3) -> cadquery.Workplane:
+    """
+    Fuses the objects in glue mode (see: PerfConfig.glue_mode) where the construction allows it: OCCT's glue option skips most
+    of the face/face intersections of shapes that share faces but do not overlap.
+
+    The slot of a key and its connectors share faces only, thus each slot group is fused in glue mode first; so are the slot groups
+    of neighboured keys. Other objects (i.e. caps, switches) may overlap: these are fused by a normal fuse with the shapes whose
+    bounding boxes, shrunk by the tolerance, overlap theirs, each cluster on its own. Finally all slot groups and clusters,
+    which touch each other only, are fused in glue mode at once.
+
+    @param groups: named objects of each key (see: KeyUtils.squash_objects)
+    """
+    shapes = list()  # type: List[cadquery.Shape]
+    is_group = list()  # type: List[bool]
+    for group in groups:
+        glued = union_solids([obj for name, obj in group if is_glued(name)])
+        if len(glued) > 0:
+            shapes.append(boolean.fuse_shapes(glued, glue=True))
+            is_group.append(True)
+        others = union_solids([obj for name, obj in group if not is_glued(name)])
+        shapes.extend(others)
+        is_group.extend([False] * len(others))
+
+    # slot groups touch each other only, thus pairs of slot groups need no normal fuse whatever their bounding boxes
+    overlaps = [(a, b) for a, b in overlapping_pairs(bounding_boxes(shapes, -tolerance)) if not (is_group[a] and is_group[b])]
+    fused = [boolean.fuse_shapes([shapes[i] for i in cluster]) for cluster in clusters(len(shapes), overlaps)]
+    print("  {} slot groups glued, {} of {} other solids overlap, fused without glue mode".format(
+        sum(is_group), len(set(i for pair in overlaps for i in pair if not is_group[i])), is_group.count(False)))
+
+    union = boolean.fuse_shapes(fused, glue=True)
+    return cadquery.Workplane().newObject([unify_same_domain(union) if clean else union])
+
+
+def spatial_regions(shapes: List[cadquery.Shape], count: int) -> List[List[int]]:
+    """
+    Splits the shapes into regions of neighboured shapes: slabs along the x-axis (the keyboard's width) with an equal number
+    of shapes each, ordered by the x-coordinate of the bounding box center.
+    @return: the shape indices of each region
+    """
+    boxes = bounding_boxes(shapes, 0.0)
+    order = [int(i) for i in numpy.argsort((boxes[:, 0] + boxes[:, 3]) / 2, kind="stable")]
+    count = max(1, min(count, len(shapes)))
+    return [sorted(order[len(order) * r // count:len(order) * (r + 1) // count]) for r in range(count)]
+
+
+def _fuse_region(shapes: List[cadquery.Shape], method: str) -> cadquery.Shape:
+    return unify_same_domain(_fuse([[("", cadquery.Workplane().add(shape))] for shape in shapes], method, False, 1).val())
+
+
+def _fuse_region_brep(args: Tuple[bytes, str]) -> Any:
+    """
+    Worker: fuses and cleans the shapes serialized by workplane_to_brep(); returns the result for transport (see: send_shape).
+    """
+    data, method = args
+    return send_shape(cadquery.Workplane().add(_fuse_region(workplane_from_brep(data).vals(), method)))
+
+
+def fuse_regional(groups: List[List[Tuple[str, cadquery.Workplane]]], method: str, jobs: int) -> cadquery.Workplane:
+    """
+    Fuses and cleans spatial regions (see: spatial_regions) of the objects, in parallel with more than one job;
+    then fuses the regions and unifies same domain faces and edges once more for the seams in between.
+    Regions consist of solids without names, thus the "glue" method fuses no slot groups within regions.
+
+    @param method: fuse method within regions (see: PerfConfig.fuse_method)
+    @param jobs: number of worker processes; the number of regions is the number of jobs, but at least two
+    """
+    shapes = union_solids([obj for group in groups for _, obj in group])
+    regions = [[shapes[i] for i in region] for region in spatial_regions(shapes, max(2, effective_jobs(jobs)))]
+    if effective_jobs(jobs) <= 1:
+        fused_regions = [_fuse_region(region, method) for region in regions]
+    else:
+        args = [(workplane_to_brep(cadquery.Workplane().add(region)), method) for region in regions]
+        fused_regions = [receive_shape(data).val() for data in parallel_map(_fuse_region_brep, args, jobs)]
+    print("  {} regions of {} solids".format(len(regions), " + ".join(str(len(region)) for region in regions)))
+    return cadquery.Workplane().newObject([unify_same_domain(boolean.fuse_shapes(fused_regions))])
+
+
+def _fuse(groups: List[List[Tuple[str, cadquery.Workplane]]], method: str, clean: bool, jobs: int) -> cadquery.Workplane:
+    objs = [obj for group in groups for _, obj in group]  # type: List[cadquery.Workplane]
+    if method == "sequential":
+        return fuse_sequential(objs, clean)
+    if method == "tree":
+        return fuse_tree(objs, clean, jobs)
+    if method == "multi":
+        return fuse_multi(objs, clean)
+    if method == "clustered":
+        return fuse_clustered(objs, clean)
+    if method == "glue":
+        return fuse_glued(groups, clean)
+    assert False, "unknown fuse method: {}".format(method)
+
+
+def fuse(groups: List[List[Tuple[str, cadquery.Workplane]]], method: str, clean: bool, jobs: int = 1) -> cadquery.Workplane:
+    """
+    @param groups: named objects to unify, grouped by key (see: KeyUtils.squash_objects); each object must have at least one solid
+    @param method: "sequential", "tree", "multi", "clustered" or "glue" (see: PerfConfig.fuse_method); only "glue" considers the groups
+    @param clean: unify same domain faces and edges as configured by PerfConfig.clean_mode
+    @param jobs: number of worker processes for the "tree" method and "regional" clean mode
+    """
+    groups = [group for group in groups if len(group) > 0]
+    if len(groups) == 0:
+        return cadquery.Workplane()
+    if not clean:
+        return _fuse(groups, method, False, jobs)
+    if PERF.clean_mode == "incremental":
+        return _fuse(groups, method, True, jobs)
+    if PERF.clean_mode == "final":
+        return cadquery.Workplane().newObject([unify_same_domain(_fuse(groups, method, False, jobs).val())])
+    if PERF.clean_mode == "regional":
+        return fuse_regional(groups, method, jobs)
+    assert False, "unknown clean mode: {}".format(PERF.clean_mode)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import cadquery
+import numpy
+
+from .key_mixins import Direction, CartesianRoot
+
+if TYPE_CHECKING:
+    from .key import Key
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+# array index of corner directions
+X_INDEX = {Direction.LEFT: 0, Direction.RIGHT: 1}  # type: Dict[Direction, int]
+Y_INDEX = {Direction.FRONT: 0, Direction.BACK: 1}  # type: Dict[Direction, int]
+
+
+def axis_rotation_matrix(axis: Tuple[float, float, float], angle: float) -> numpy.ndarray:
+    """
+    Rotation matrix about an axis through the origin (Rodrigues' formula).
+    @param axis: rotation axis, normalized
+    @param angle: rotation angle in [deg]
+    """
+    x, y, z = axis
+    radians = numpy.radians(angle)
+    c, s = numpy.cos(radians), numpy.sin(radians)
+    k = numpy.array([[0.0, -z, y],
+                     [z, 0.0, -x],
+                     [-y, x, 0.0]])
+    return numpy.eye(3) + s * k + (1.0 - c) * (k @ k)
+
+
+def key_rotation_matrix(relative: CartesianRoot, total_rotation: Tuple[float, float, float]) -> numpy.ndarray:
+    """
+    The rotation applied to each key component after computation (see: CadKeyMixin.placement_location):
+    rotation around the relative z, then x, then y-axis through the origin.
+    """
+    rx, ry, rz = total_rotation
+    return axis_rotation_matrix(relative.y_axis, ry) @ axis_rotation_matrix(relative.x_axis, rx) @ axis_rotation_matrix(relative.z_axis, rz)
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class KeyGeometryTable(object):
+    """
+    World coordinates of the switch slot corner edges of all keys.
+
+    The points follow from the placement (position and rotation) and the component dimensions only (see: KeySwitchSlot.local_corners),
+    thus they are computed in one batched pass instead of being selected from the final solids.
+    The result is equal to KeySwitchSlot.get_cad_corner_edge() up to floating point precision.
+
+    Arrays (n: number of keys):
+      - slot_corners: n × 2 (x: left, right) × 2 (y: front, back) × 2 (z: bottom, top) × 3
+    """
+
+    def __init__(self, key_matrix: List[List[Key]]):
+        keys = [key for row in key_matrix for key in row]  # type: List[Key]
+        self.index = {id(key): i for i, key in enumerate(keys)}  # type: Dict[int, int]
+
+        n = len(keys)
+        rotations = numpy.empty((n, 3, 3))
+        translations = numpy.empty((n, 3))
+        local_slot_corners = numpy.empty((n, 2, 2, 2, 3))
+        for i, key in enumerate(keys):
+            rotations[i] = key_rotation_matrix(key.base.relative_cartesian, key.base.total_rotation)
+            translations[i] = key.base.total_translation
+            local_slot_corners[i] = key.slot.local_corners(key.cap)
+
+        # p' = R · p + t for all keys and corners at once
+        self.slot_corners = numpy.einsum("nij,nxyzj->nxyzi", rotations, local_slot_corners) + translations[:, None, None, None, :]  # type: numpy.ndarray
+
+    def corner_edge(self, key: Key, direction_x: Direction, direction_y: Direction) -> Tuple[cadquery.Vector, cadquery.Vector]:
+        """
+        @return: the slot's corner edge as (bottom, top) vertex, see: KeySwitchSlot.get_cad_corner_edge()
+        """
+        corners = self.slot_corners[self.index[id(key)], X_INDEX[direction_x], Y_INDEX[direction_y]]
+        return cadquery.Vector(*corners[0]), cadquery.Vector(*corners[1])
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import List, Tuple, Sequence
+
+import numpy
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def _convex_polygon(points_2d: numpy.ndarray, tolerance: float) -> List[int]:
+    """
+    Convex hull of points in the plane (monotone chain), collinear points are dropped.
+    @return: the indices of the hull points in counter clockwise order
+    """
+    order = sorted(range(len(points_2d)), key=lambda i: (points_2d[i][0], points_2d[i][1]))
+
+    def cross(o: int, a: int, b: int) -> float:
+        return float((points_2d[a][0] - points_2d[o][0]) * (points_2d[b][1] - points_2d[o][1])
+                     - (points_2d[a][1] - points_2d[o][1]) * (points_2d[b][0] - points_2d[o][0]))
+
+    def chain(indices: List[int]) -> List[int]:
+        result = list()  # type: List[int]
+        for i in indices:
+            while len(result) >= 2 and cross(result[-2], result[-1], i) <= tolerance:
+                result.pop()
+            result.append(i)
+        return result
+
+    lower, upper = chain(order), chain(order[::-1])
+    return lower[:-1] + upper[:-1]
+
+
+def merge_coplanar_faces(points: Sequence[Sequence[float]],
+                         faces: Sequence[Sequence[int]],
+                         tolerance: float = 1e-6) -> Tuple[List[Tuple[float, float, float]], List[Tuple[int, ...]]]:
+    """
+    Simplifies a triangulated convex polyhedron (i.e. cqmore.polyhedron.hull()): coplanar triangles are merged to one convex polygon,
+    degenerate triangles (area below tolerance²) and collinear polygon vertices are dropped.
+    A vertex dropped from one face lies on an edge of its neighbour faces as well, thus it is dropped there too and the shell stays closed.
+
+    @param points: the polyhedron's points
+    @param faces: point indices of each triangle, counter clockwise seen from outside
+    @param tolerance: max. distance in [mm] of a point to the plane of a face
+    @return: the points still in use and the point indices of each polygon, counter clockwise seen from outside
+    """
+    vertices = numpy.array(points, dtype=float)
+    planes = list()  # type: List[Tuple[numpy.ndarray, float, List[int]]]
+    for face in faces:
+        a, b, c = vertices[list(face)]
+        normal = numpy.cross(b - a, c - a)
+        area = numpy.linalg.norm(normal)
+        if area / 2 < tolerance ** 2:
+            continue
+        normal = normal / area
+        for plane_normal, plane_offset, plane_points in planes:
+            if numpy.dot(normal, plane_normal) > 0 and numpy.all(numpy.abs(vertices[list(face)] @ plane_normal - plane_offset) <= tolerance):
+                plane_points.extend(i for i in face if i not in plane_points)
+                break
+        else:
+            planes.append((normal, float(numpy.dot(normal, a)), list(face)))
+
+    polygons = list()  # type: List[List[int]]
+    for normal, _, plane_points in planes:
+        # plane basis (u, v, normal) is right handed: counter clockwise in (u, v) is counter clockwise seen from outside
+        u = vertices[plane_points[1]] - vertices[plane_points[0]]
+        u = u / numpy.linalg.norm(u)
+        v = numpy.cross(normal, u)
+        points_2d = numpy.stack([vertices[plane_points] @ u, vertices[plane_points] @ v], axis=1)
+        polygon = [plane_points[i] for i in _convex_polygon(points_2d, tolerance ** 2)]
+        if len(polygon) >= 3:
+            polygons.append(polygon)
+
+    used = sorted(set(i for polygon in polygons for i in polygon))
+    index = {old: new for new, old in enumerate(used)}
+    return [tuple(float(c) for c in vertices[i]) for i in used], [tuple(index[i] for i in polygon) for polygon in polygons]
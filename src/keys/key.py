@@ -1,6 +1,9 @@
 from typing import Dict
-import math
 from .key_mixins import *
+from .object_cache import ObjectCache
+from .selectors import SELECTORS
+from . import boolean
+from src.cfg.perf import PERF
 from src import model_importer
 
 _cliargs, config = model_importer.import_config()
@@ -71,41 +74,6 @@ Construction strategy:
 """
 
 
-# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-
-class ObjectCache(object):
-    """
-    A naive cache implementation to reduce multiple computation of the same object.
-    Mainly used fot 3D CadQuery objects.
-    """
-
-    def __init__(self, config: DEBUG):
-        self.container = dict()  # type: Dict[str, cadquery.Workplane]
-        self.enabled = not config.disable_object_cache
-
-    @staticmethod
-    def cache_name(attr_1: str, *args: str) -> str:
-        attrs = "-".join(["({})".format(arg) for arg in args])
-        return "({}){}{}".format(attr_1, "-" if len(attrs) > 0 else "", attrs)
-
-    def store(self, obj: cadquery.Workplane, attr_1: str, *args: str) -> None:
-        if not self.enabled:
-            return
-        key = ObjectCache.cache_name(attr_1, *args)
-
-        if key in self.container:
-            print("failed to cache object with id {}".format(key))
-            assert False
-        self.container[key] = obj
-
-    def get(self, attr_1: str, *args: str) -> Optional[cadquery.Workplane]:
-        if not self.enabled:
-            return None
-        else:
-            key = ObjectCache.cache_name(attr_1, *args)
-            return self.container[key] if key in self.container else None
-
-
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
@@ -128,6 +96,8 @@ class KeyBase(KeyPlane, Computeable, CadObject, KeyBaseMixin):
       - filled, unfilled:        placeholder keys near the arrow keys have no holes (filled), an invisible placeholder may have a hole (we don't care)
     """
 
+    cache_namespace = "base"
+
     def __init__(self, config: config.KeyBaseConfig) -> None:
         super(KeyBase, self).__init__()
         self.unit_length = config.unit_length  # type: float
@@ -161,6 +131,19 @@ class KeyBase(KeyPlane, Computeable, CadObject, KeyBaseMixin):
         self.depth = self.unit_depth_factor * self.unit_length
         # self.compute_relative_cardinal_axis()
 
+    def compute(self, cache: ObjectCache, *args, **kwargs) -> None:
+        """
+        Computes the base plane at the coordinate origin (see: Computeable.compute); the plane is fully determined by its size.
+        """
+        cached = cache.get(self.cache_namespace, self.width, self.depth)
+        if cached is None:
+            super(KeyBase, self).compute()
+            # shared in between keys: drop the pending rect wire so that derived objects (see: post_compute_key_origin) do not consume it
+            self._cad_object = cadquery.Workplane().add(self._cad_object.vals())
+            cache.store(self._cad_object, self.cache_namespace, self.width, self.depth)
+        else:
+            self._cad_object = cached
+
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
@@ -175,8 +158,13 @@ class KeyCap(KeyBox, Computeable, CadObject):
       - thickness:             key cap height
       - width/depth clearance: clearance in between keys (footprint to footprint)
       - z clearance:           space in between key cap bottom and top skin of key base
+
+    Non-rectangular caps (i.e. iso enter) subclass KeyCap and re-implement cache_parameters() and construct();
+    the subclass shall use its own cache namespace (see: Key.cap_type).
     """
 
+    cache_namespace = "cap"
+
     def __init__(self, config: config.KeyCapConfig) -> None:
         super(KeyCap, self).__init__()
         self.width_clearance = config.width_clearance  # type: float
@@ -186,27 +174,42 @@ class KeyCap(KeyBox, Computeable, CadObject):
         self.dish_inset = config.dish_inset  # type: float
         self.width = 0  # type: float
         self.depth = 0  # type: float
+        self.unit_length = 0  # type: float
 
     def update(self, unit_width_factor: float = 1, unit_depth_factor: float = 1, unit_length: float = config.MODEL_CONFIG.key_base.unit_length, *args, **kwargs) -> None:
+        self.unit_length = unit_length
         self.width = unit_width_factor * unit_length - self.width_clearance
         self.depth = unit_depth_factor * unit_length - self.depth_clearance
 
+    def cache_parameters(self) -> Tuple:
+        """
+        Parameters that determine the cap shape besides the registered config section (see: ObjectCache.register_namespace).
+        """
+        return self.width, self.depth
+
+    def construct(self) -> cadquery.Workplane:
+        """
+        Constructs the cap at the coordinate origin.
+        """
+        displacement = (0, 0, self.z_clearance)  # type: Tuple[float, float, float]
+        return cadquery.Workplane() \
+            .wedge(self.width,
+                   self.thickness,
+                   self.depth,
+                   1,
+                   1,
+                   self.width - 1,
+                   self.depth - 1,
+                   centered=(True, False, True)) \
+            .rotate((0, 0, 0), (1, 0, 0), 90) \
+            .translate(displacement)
+
     def compute(self, cache: ObjectCache, *args, **kwargs) -> None:
-        cached = cache.get("cap", str(self.width), str(self.depth))
+        cache_parameters = self.cache_parameters()
+        cached = cache.get(self.cache_namespace, *cache_parameters)
         if cached is None:
-            displacement = (0, 0, self.z_clearance)  # type: Tuple[float, float, float]
-            self._cad_object = cadquery.Workplane() \
-                .wedge(self.width,
-                       self.thickness,
-                       self.depth,
-                       1,
-                       1,
-                       self.width - 1,
-                       self.depth - 1,
-                       centered=(True, False, True)) \
-                .rotate((0, 0, 0), (1, 0, 0), 90) \
-                .translate(displacement)
-            cache.store(self._cad_object, "cap", str(self.width), str(self.depth))
+            self._cad_object = self.construct()
+            cache.store(self._cad_object, self.cache_namespace, *cache_parameters)
         else:
             self._cad_object = cached
 
@@ -214,12 +217,44 @@ class KeyCap(KeyBox, Computeable, CadObject):
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
+class TopologyIndex(object):
+    """
+    Lookup table of resolved faces, corner edges and corner vertices of a cad object.
+
+    Selectors on the full solid are expensive and the connection mapping queries the same faces/edges several times per key.
+    The index is bound to the cad object and the cartesian root it has been built for and becomes invalid if either changes.
+
+    Keys:
+      - faces:           Direction (front, back, left, right)
+      - corner edges:    (Direction x, Direction y) -> (bottom, top)
+      - corner vertices: (Direction x, Direction y, Direction z)
+    """
+
+    def __init__(self, cad_object: cadquery.Workplane, cartesian_root: CartesianRoot):
+        self.cad_object = cad_object  # type: cadquery.Workplane
+        self.axes = (cartesian_root.x_axis, cartesian_root.y_axis, cartesian_root.z_axis)
+        self.faces = dict()  # type: Dict[Direction, cadquery.Workplane]
+        self.corner_edges = dict()  # type: Dict[Tuple[Direction, Direction], Tuple[cadquery.Vector, cadquery.Vector]]
+        self.corner_vertices = dict()  # type: Dict[Tuple[Direction, Direction, Direction], cadquery.Vector]
+
+    def is_valid_for(self, cad_object: cadquery.Workplane, cartesian_root: CartesianRoot) -> bool:
+        return self.cad_object is cad_object and self.axes == (cartesian_root.x_axis, cartesian_root.y_axis, cartesian_root.z_axis)
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
 class KeySwitchSlot(KeyBox, Computeable, CadObject):
     """
     A slot is the cutout from the key base so that the key switch fits in.
     This implementation is slightly configurable but only supports the Gateron key switch model.
+
+    Slots of non-rectangular keys (i.e. iso enter) subclass KeySwitchSlot and re-implement construct();
+    the subclass shall use its own cache namespace (see: Key.slot_type).
     """
 
+    cache_namespace = "slot"
+
     def __init__(self, config: config.KeySwitchSlotConfig) -> None:
         super(KeySwitchSlot, self).__init__()
         self.slot_width = config.width  # type: float
@@ -228,99 +263,142 @@ class KeySwitchSlot(KeyBox, Computeable, CadObject):
         self.undercut_depth = config.undercut_depth  # type: float
         self.undercut_width = config.undercut_width  # type: float
         self.undercut_thickness = config.undercut_thickness  # type: float
+        self._topology_index = None  # type: Optional[TopologyIndex]
+
+    def cache_parameters(self, cap: KeyCap, do_fill: bool) -> Tuple:
+        """
+        The slot is fully determined by the cap shape and the slot dimensions.
+        The key is derived from parameters only, so that a cache hit needs no topology queries at all.
+        """
+        return (type(self),
+                type(cap), cap.cache_parameters(),
+                self.slot_width, self.slot_depth, self.thickness,
+                self.undercut_width, self.undercut_depth, self.undercut_thickness,
+                do_fill)
 
-    def compute(self, basis_face: cadquery.Workplane, do_fill: bool, cache: ObjectCache, cartesian_root: Optional[CartesianRoot], *args, **kwargs) -> None:
+    def compute(self, cap: KeyCap, do_fill: bool, cache: ObjectCache, cartesian_root: Optional[CartesianRoot], *args, **kwargs) -> None:
         """
         To ensure the key cap clearance (in case keys are not placed planar),
         we use the key cap footprint as base size for the key slot.
 
         @precondition: key cap cad object has been computed
-        @param basis_face: the bottom face of the key cap
+        @param cap: the key cap; its bottom face is the basis of the slot
         @param do_fill: compute skin rather than slot
         @param cache: container for lookup or storing
         @param cartesian_root: cartesian axis to use for face selection;
           if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
         """
 
-        x_str = "{}".format(cartesian_root.x_axis)
-        y_str = "{}".format(cartesian_root.y_axis)
-        z_str = "{}".format(cartesian_root.z_axis)
+        cache_parameters = self.cache_parameters(cap, do_fill)
+        cached = cache.get(self.cache_namespace, *cache_parameters)
+
+        if cached is None:
+            self._cad_object = self.construct(cap.get_cad_object().faces(SELECTORS.get("<{Z}")), do_fill, cartesian_root)
+            cache.store(self._cad_object, self.cache_namespace, *cache_parameters)
+        else:
+            self._cad_object = cached
+
+    def construct(self, basis_face: cadquery.Workplane, do_fill: bool, cartesian_root: CartesianRoot) -> cadquery.Workplane:
+        """
+        Constructs the slot at the coordinate origin.
+
+        @param basis_face: the bottom face of the key cap
+        @param do_fill: compute skin rather than slot
+        @param cartesian_root: cartesian axis to use for face selection
+        """
         xz = cartesian_root.zx_normal
         yz = cartesian_root.yz_normal
 
-        # use diagonals as further caching attributes (face selection sometimes returns a cadquery.Vector instead of cadquery.Vertex)
-        tl = self._to_vertex(basis_face.vertices("<{X} and >{Y}".format(X=x_str, Y=y_str)).val())
-        tr = self._to_vertex(basis_face.vertices(">{X} and >{Y}".format(X=x_str, Y=y_str)).val())
-        bl = self._to_vertex(basis_face.vertices("<{X}".format(X=x_str)).val())  # type: cadquery.Vertex
-        br = self._to_vertex(basis_face.vertices(">{X} and <{Y}".format(X=x_str, Y=y_str)).val())
-        diag1 = math.dist([tl.X, tl.Y], [br.X, br.Y])
-        diag2 = math.dist([tr.X, tr.Y], [bl.X, bl.Y])
+        offset = self._to_vertex(basis_face.vertices(SELECTORS.get(">{Z}", cartesian_root)).first().val())
+        z_offset = offset.Z
 
-        cached = cache.get("slot", str(diag1), str(diag2), str(do_fill))
-
-        if cached is None:
-            offset = self._to_vertex(basis_face.vertices(">{Z}".format(Z=z_str)).first().val())
-            z_offset = offset.Z
-
-            if do_fill:
-                skin = cadquery.Workplane().sketch() \
-                    .face(basis_face.edges().vals()).faces("<{Z}".format(Z=z_str)) \
-                    .finalize().extrude(-self.thickness) \
-                    .translate((0, 0, -z_offset))
-                self._cad_object = skin
-            else:
-                top_skin = cadquery.Workplane().sketch() \
-                    .face(basis_face.edges().vals()).faces("<{Z}".format(Z=z_str)) \
-                    .rect(self.slot_width, self.slot_depth, angle=90, mode="s").finalize().extrude(-self.undercut_thickness) \
-                    .translate((0, 0, -z_offset))
-
-                undercut_front = cadquery.Workplane() \
-                    .box(self.undercut_width, self.undercut_depth, self.thickness) \
-                    .translate((0, -self.slot_depth / 2 - self.undercut_depth / 2, -self.undercut_thickness - self.thickness / 2))
-                undercut_back = undercut_front.mirror(xz)
-                undercut_left = cadquery.Workplane() \
-                    .box(self.undercut_depth, self.undercut_width, self.thickness) \
-                    .translate((-self.slot_width / 2 - self.undercut_depth / 2, 0, -self.undercut_thickness - self.thickness / 2))
-                undercut_right = undercut_left.mirror(yz)
-                undercuts = undercut_front.union(undercut_right).union(undercut_back).union(undercut_left)
-
-                bottom_skin = cadquery.Workplane().sketch().face(top_skin.faces("<Z".format(Z=z_str)).edges().vals()).faces("<{Z}".format(Z=z_str)) \
-                    .finalize().extrude(-(self.thickness - self.undercut_thickness))\
-                    .cut(undercuts)
-                self._cad_object = top_skin.union(bottom_skin)
-
-            cache.store(self._cad_object, "slot", str(diag1), str(diag2), str(do_fill))
+        if do_fill:
+            skin = cadquery.Workplane().sketch() \
+                .face(basis_face.edges().vals()).faces(SELECTORS.get("<{Z}", cartesian_root)) \
+                .finalize().extrude(-self.thickness) \
+                .translate((0, 0, -z_offset))
+            return skin
         else:
-            self._cad_object = cache.get("slot", str(diag1), str(diag2), str(do_fill))
+            top_skin = cadquery.Workplane().sketch() \
+                .face(basis_face.edges().vals()).faces(SELECTORS.get("<{Z}", cartesian_root)) \
+                .rect(self.slot_width, self.slot_depth, angle=90, mode="s").finalize().extrude(-self.undercut_thickness) \
+                .translate((0, 0, -z_offset))
+
+            undercut_front = cadquery.Workplane() \
+                .box(self.undercut_width, self.undercut_depth, self.thickness) \
+                .translate((0, -self.slot_depth / 2 - self.undercut_depth / 2, -self.undercut_thickness - self.thickness / 2))
+            undercut_back = undercut_front.mirror(xz)
+            undercut_left = cadquery.Workplane() \
+                .box(self.undercut_depth, self.undercut_width, self.thickness) \
+                .translate((-self.slot_width / 2 - self.undercut_depth / 2, 0, -self.undercut_thickness - self.thickness / 2))
+            undercut_right = undercut_left.mirror(yz)
+            undercuts = boolean.union(boolean.union(boolean.union(undercut_front, undercut_right), undercut_back), undercut_left)
+
+            bottom_skin = cadquery.Workplane().sketch().face(top_skin.faces(SELECTORS.get("<{Z}")).edges().vals()).faces(SELECTORS.get("<{Z}", cartesian_root)) \
+                .finalize().extrude(-(self.thickness - self.undercut_thickness))
+            return boolean.union(top_skin, boolean.cut(bottom_skin, undercuts))
+
+    def local_corners(self, cap: KeyCap) -> Tuple:
+        """
+        Corner points of the slot as constructed at the coordinate origin, before rotation and translation.
+        The slot's top skin is at z = 0, the footprint equals the key cap's footprint.
 
-    def get_cad_corner_edge(self, direction_x: Direction, direction_y: Direction, cartesian_root: CartesianRoot) -> Tuple[cadquery.Vector, cadquery.Vector]:
+        @return: nested tuple [x: left, right][y: front, back][z: bottom, top] of (x, y, z) points (see: KeyGeometryTable)
         """
-        @param direction_x
-        @param direction_y
+        return tuple(tuple(((x, y, -self.thickness), (x, y, 0.0))
+                           for y in (-cap.depth / 2, cap.depth / 2))
+                     for x in (-cap.width / 2, cap.width / 2))
+
+    def build_topology_index(self, cartesian_root: CartesianRoot) -> TopologyIndex:
+        """
+        Resolves all side faces, corner edges and corner vertices once, so that subsequent queries are dictionary lookups.
+        Built once the slot is placed (see: Key.compute), re-built only if invalidated (see: topology_index).
         @param cartesian_root: cartesian axis to use for face selection;
           if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
         """
-        x_str = "{}".format(cartesian_root.x_axis)
-        y_str = "{}".format(cartesian_root.y_axis)
-        z_str = "{}".format(cartesian_root.z_axis)
+        index = TopologyIndex(self.get_cad_object(), cartesian_root)
 
-        if direction_y is Direction.BACK:
-            face = self.get_cad_object().faces(">{Y}".format(Y=y_str))  # type: Optional[cadquery.Workplane]
-        elif direction_y is Direction.FRONT:
-            face = self.get_cad_object().faces("<{Y}".format(Y=y_str))  # type: Optional[cadquery.Workplane]
-        else:
-            assert False
+        index.faces[Direction.FRONT] = self._cad_object.faces(SELECTORS.get("|{Y}", cartesian_root)).faces(SELECTORS.get("<{Y}", cartesian_root))
+        index.faces[Direction.BACK] = self._cad_object.faces(SELECTORS.get("|{Y}", cartesian_root)).faces(SELECTORS.get(">{Y}", cartesian_root))
+        index.faces[Direction.LEFT] = self._cad_object.faces(SELECTORS.get("|{X}", cartesian_root)).faces(SELECTORS.get("<{X}", cartesian_root))
+        index.faces[Direction.RIGHT] = self._cad_object.faces(SELECTORS.get("|{X}", cartesian_root)).faces(SELECTORS.get(">{X}", cartesian_root))
+        self._index_corners(index, cartesian_root)
 
-        if direction_x is Direction.LEFT:
-            edge = face.edges("<{X}".format(X=x_str))
-        elif direction_x is Direction.RIGHT:
-            edge = face.edges(">{X}".format(X=x_str))
-        else:
-            assert False
+        self._topology_index = index
+        return index
+
+    def _index_corners(self, index: TopologyIndex, cartesian_root: CartesianRoot) -> None:
+        """
+        Resolves the corner edges and vertices; corner vertices are the end points of the corner edges.
+        """
+        for direction_y, face_selector in [(Direction.BACK, ">{Y}"), (Direction.FRONT, "<{Y}")]:
+            face = self._cad_object.faces(SELECTORS.get(face_selector, cartesian_root))  # type: cadquery.Workplane
+            for direction_x, edge_selector in [(Direction.LEFT, "<{X}"), (Direction.RIGHT, ">{X}")]:
+                edge = face.edges(SELECTORS.get(edge_selector, cartesian_root))
+                bottom = self._to_vertex(edge.vertices(SELECTORS.get("<{Z}", cartesian_root)).val().Center()).Center()
+                top = self._to_vertex(edge.vertices(SELECTORS.get(">{Z}", cartesian_root)).val().Center()).Center()
+                index.corner_edges[(direction_x, direction_y)] = (bottom, top)
+                index.corner_vertices[(direction_x, direction_y, Direction.BOTTOM)] = bottom
+                index.corner_vertices[(direction_x, direction_y, Direction.TOP)] = top
+
+    def topology_index(self, cartesian_root: CartesianRoot) -> TopologyIndex:
+        """
+        @return: the topology index, re-built if the cad object or the cartesian root changed since the last build
+        """
+        if self._topology_index is None or not self._topology_index.is_valid_for(self.get_cad_object(), cartesian_root):
+            self.build_topology_index(cartesian_root)
+        return self._topology_index
 
-        bottom = self._to_vertex(edge.vertices("<{Z}".format(Z=z_str)).val().Center())
-        top = self._to_vertex(edge.vertices(">{Z}".format(Z=z_str)).val().Center())
-        return bottom.Center(), top.Center()
+    def get_cad_corner_edge(self, direction_x: Direction, direction_y: Direction, cartesian_root: CartesianRoot) -> Tuple[cadquery.Vector, cadquery.Vector]:
+        """
+        @param direction_x
+        @param direction_y
+        @param cartesian_root: cartesian axis to use for face selection;
+          if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
+        """
+        corner_edges = self.topology_index(cartesian_root).corner_edges
+        assert (direction_x, direction_y) in corner_edges
+        return corner_edges[(direction_x, direction_y)]
 
     def get_cad_corner_vertex(self, direction_x: Direction, direction_y: Direction, direction_z: Direction, cartesian_root: CartesianRoot) -> cadquery.Vector:
         """
@@ -336,31 +414,9 @@ class KeySwitchSlot(KeyBox, Computeable, CadObject):
           if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
         @return:
         """
-
-        x_str = "{}".format(cartesian_root.x_axis)
-        y_str = "{}".format(cartesian_root.y_axis)
-        z_str = "{}".format(cartesian_root.z_axis)
-
-        if direction_z == Direction.TOP:
-            face = self.get_cad_object().faces(">{Z}".format(Z=z_str))  # type: Optional[cadquery.Workplane]
-        elif direction_z == Direction.BOTTOM:
-            face = self.get_cad_object().faces("<{Z}".format(Z=z_str))  # type: Optional[cadquery.Workplane]
-        else:
-            assert False
-
-        if direction_y is Direction.BACK:
-            face = face.vertices(">{Y}".format(Y=y_str))
-        elif direction_y is Direction.FRONT:
-            face = face.vertices("<{Y}".format(Y=y_str))
-        else:
-            assert False
-
-        if direction_x is Direction.LEFT:
-            return face.vertices("<{X}".format(X=x_str)).val().Center()
-        elif direction_x is Direction.RIGHT:
-            return face.vertices(">{X}".format(X=x_str)).val().Center()
-        else:
-            assert False
+        corner_vertices = self.topology_index(cartesian_root).corner_vertices
+        assert (direction_x, direction_y, direction_z) in corner_vertices
+        return corner_vertices[(direction_x, direction_y, direction_z)]
 
     def get_cad_face(self, direction: Direction, cartesian_root: CartesianRoot) -> cadquery.Workplane:
         """
@@ -368,19 +424,9 @@ class KeySwitchSlot(KeyBox, Computeable, CadObject):
         @param cartesian_root: cartesian axis to use for face selection;
           if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
         """
-        x_str = "{}".format(cartesian_root.x_axis)
-        y_str = "{}".format(cartesian_root.y_axis)
-
-        if direction is Direction.FRONT:
-            return self._cad_object.faces("|{Y}".format(Y=y_str)).faces("<{Y}".format(Y=y_str))
-        elif direction is Direction.BACK:
-            return self._cad_object.faces("|{Y}".format(Y=y_str)).faces(">{Y}".format(Y=y_str))
-        elif direction is Direction.LEFT:
-            return self._cad_object.faces("|{X}".format(X=x_str)).faces("<{X}".format(X=x_str))
-        elif direction is Direction.RIGHT:
-            return self._cad_object.faces("|{X}".format(X=x_str)).faces(">{X}".format(X=x_str))
-        else:
-            assert False
+        faces = self.topology_index(cartesian_root).faces
+        assert direction in faces
+        return faces[direction]
 
     @staticmethod
     def _to_vertex(v: Union[cadquery.Vector, cadquery.Vertex]) -> cadquery.Vertex:
@@ -400,26 +446,31 @@ class KeyConnector(CadObject):
 
     def __init__(self):
         super(KeyConnector, self).__init__()
+        self._topology_index = None  # type: Optional[TopologyIndex]
 
     def get_cad_face(self, direction: Direction, cartesian_root: CartesianRoot) -> cadquery.Workplane:
         """
+        Faces are resolved on first request and then looked up (see: TopologyIndex).
         @param direction
         @param cartesian_root: cartesian axis to use for face selection;
           if the object is rotated, the cartesian root must share the same rotation for selectors (parallel/orthogonal/...)
         """
-        x_str = "{}".format(cartesian_root.x_axis)
-        y_str = "{}".format(cartesian_root.y_axis)
-
-        if direction is Direction.FRONT:
-            return self._cad_object.faces("|{Y}".format(Y=y_str)).faces("<{Y}".format(Y=y_str))
-        elif direction is Direction.BACK:
-            return self._cad_object.faces("|{Y}".format(Y=y_str)).faces(">{Y}".format(Y=y_str))
-        elif direction is Direction.LEFT:
-            return self._cad_object.faces("|{X}".format(X=x_str)).faces("<{X}".format(X=x_str))
-        elif direction is Direction.RIGHT:
-            return self._cad_object.faces("|{X}".format(X=x_str)).faces(">{X}".format(X=x_str))
-        else:
-            assert False
+        if self._topology_index is None or not self._topology_index.is_valid_for(self.get_cad_object(), cartesian_root):
+            self._topology_index = TopologyIndex(self.get_cad_object(), cartesian_root)
+        faces = self._topology_index.faces
+
+        if direction not in faces:
+            if direction is Direction.FRONT:
+                faces[direction] = self._cad_object.faces(SELECTORS.get("|{Y}", cartesian_root)).faces(SELECTORS.get("<{Y}", cartesian_root))
+            elif direction is Direction.BACK:
+                faces[direction] = self._cad_object.faces(SELECTORS.get("|{Y}", cartesian_root)).faces(SELECTORS.get(">{Y}", cartesian_root))
+            elif direction is Direction.LEFT:
+                faces[direction] = self._cad_object.faces(SELECTORS.get("|{X}", cartesian_root)).faces(SELECTORS.get("<{X}", cartesian_root))
+            elif direction is Direction.RIGHT:
+                faces[direction] = self._cad_object.faces(SELECTORS.get("|{X}", cartesian_root)).faces(SELECTORS.get(">{X}", cartesian_root))
+            else:
+                assert False
+        return faces[direction]
 
 
 class KeyConnectors(IterableObject):
@@ -459,17 +510,32 @@ class KeyConnectors(IterableObject):
 
 class KeySwitch(KeyBox, Computeable, CadObject):
 
+    cache_namespace = "switch"
+
     def __init__(self, config: config.KeySwitchConfig) -> None:
         super(KeySwitch, self).__init__()
         self.width = config.width  # type: float
         self.depth = config.depth  # type: float
         self.thickness = config.thickness  # type: float
 
+    def compute(self, cache: ObjectCache, *args, **kwargs) -> None:
+        """
+        Computes the switch's bounding box at the coordinate origin (see: Computeable.compute).
+        """
+        cached = cache.get(self.cache_namespace, self.width, self.depth, self.thickness)
+        if cached is None:
+            super(KeySwitch, self).compute()
+            cache.store(self._cad_object, self.cache_namespace, self.width, self.depth, self.thickness)
+        else:
+            self._cad_object = cached
+
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
 class DactylKey(object):
+    # partitions of a partitioned build (see: partition)
+    partitions = ("left", "right", "arrow", "numpad")  # type: Tuple[str, ...]
 
     def __init__(self) -> None:
         self.is_left_hand = True  # type: bool
@@ -480,6 +546,17 @@ class DactylKey(object):
     def is_right_hand(self) -> bool:
         return False if self.is_left_hand else True
 
+    @property
+    def partition(self) -> str:
+        """
+        @return: the partition the key belongs to: arrow and numpad block take precedence over the hand
+        """
+        if self.is_numpad_block:
+            return "numpad"
+        if self.is_arrow_block:
+            return "arrow"
+        return "left" if self.is_left_hand else "right"
+
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
@@ -499,12 +576,15 @@ class CadObjects(IterableObject):
 
 
 class Key(Computeable, CadKeyMixin, DactylAttributesMixin):
-    object_cache = ObjectCache(DEBUG)
+    object_cache = ObjectCache(DEBUG, PERF)
+    # component types: keys with non-rectangular caps re-define these with KeyCap/KeySwitchSlot subclasses
+    cap_type = KeyCap
+    slot_type = KeySwitchSlot
 
     def __init__(self) -> None:
         self.base = KeyBase(config.MODEL_CONFIG.key_base)
-        self.cap = KeyCap(config.MODEL_CONFIG.cap)
-        self.slot = KeySwitchSlot(config.MODEL_CONFIG.switch_slot)
+        self.cap = self.cap_type(config.MODEL_CONFIG.cap)
+        self.slot = self.slot_type(config.MODEL_CONFIG.switch_slot)
         self.switch = KeySwitch(config.MODEL_CONFIG.switch)
         self.connectors = KeyConnectors()
         self.cad_objects = CadObjects()
@@ -520,18 +600,24 @@ class Key(Computeable, CadKeyMixin, DactylAttributesMixin):
         self.switch.update()
         self.slot.update()
 
-    def compute(self):
+    def compute(self, index_topology: bool = True):
+        """
+        @param index_topology: build the slot's topology index once placed (see: KeySwitchSlot.build_topology_index);
+                               False if the slot is passed to another process, which builds the index for the received slot
+        """
         # compute key components at coordinate origin
-        self.base.compute()
+        self.base.compute(cache=Key.object_cache)
         self.cap.compute(cache=Key.object_cache)
-        self.slot.compute(basis_face=self.cap.get_cad_object().faces("<Z"),
+        self.slot.compute(cap=self.cap,
                           do_fill=self.base.is_filled,
                           cache=Key.object_cache,
                           cartesian_root=self.base.relative_cartesian)
         if DEBUG.render_switch:
-            self.switch.compute()
+            self.switch.compute(cache=Key.object_cache)
         # translate cad objects to final position
         self.final_post_compute()
+        if index_topology:
+            self.slot.build_topology_index(self.base.relative_cartesian)
 
         self.expose_cad_objects()
 
@@ -554,3 +640,11 @@ class Key(Computeable, CadKeyMixin, DactylAttributesMixin):
         ]
         for name, connector in [ct for ct in to_expose if ct[1].has_cad_object()]:
             self.cad_objects.connectors.append((name, connector.get_cad_object()))
+
+
+Key.object_cache.register_namespace(KeyBase.cache_namespace)
+Key.object_cache.register_namespace(KeyCap.cache_namespace, config.MODEL_CONFIG.cap)
+Key.object_cache.register_namespace(KeySwitchSlot.cache_namespace, config.MODEL_CONFIG.cap, config.MODEL_CONFIG.switch_slot)
+Key.object_cache.register_namespace(KeyLabel.cache_namespace)
+Key.object_cache.register_namespace(KeySwitch.cache_namespace)
+Key.object_cache.register_namespace("origin")
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import math
 import operator
 from cmath import sqrt
+from time import perf_counter
 from typing import TYPE_CHECKING, Union, List, Tuple, Optional
 from enum import Enum
 import cadquery
+import numpy
+from OCP.gp import gp_Ax1, gp_Dir, gp_Pnt, gp_Trsf, gp_Vec
 
 if TYPE_CHECKING:
     from .key import Key
 
 from src.cfg.debug import DEBUG
+from .rotation import cardinal_rotation_matrices
+from .label import KeyLabel
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -238,24 +244,20 @@ class KeyPlane(KeyRect):
         """
         self.relative_cartesian.origin = tuple(map(operator.add, self.position, self.position_offset))
 
-    def compute_relative_cardinal_rotation(self) -> None:
+    @staticmethod
+    def compute_relative_cardinal_rotations(planes: List[KeyPlane]) -> None:
         """
-        Updates the relative cartesian vectors according to the total rotation (rotation + rotation_offset).
-        Note: the computation misuses CadQuery for sake of laziness.
+        Updates the relative cartesian vectors of the planes according to their total rotation (rotation + rotation_offset):
+        rotation around the absolute z, then x, then y-axis (see: cardinal_rotation_matrices).
+        The matrices of all distinct rotations are evaluated at once.
         """
-
-        rx, ry, rz = self.total_rotation
-        cq_origin = cadquery.Vector(self.ABSOLUTE_CARTESIAN.origin)
-        cq_vec_x, cq_vec_y, cq_vec_z = cadquery.Vector(self.ABSOLUTE_CARTESIAN.x_axis), cadquery.Vector(self.ABSOLUTE_CARTESIAN.y_axis), cadquery.Vector(self.ABSOLUTE_CARTESIAN.z_axis)
-        cq_line_x = cadquery.Edge.makeLine(cq_origin, cq_vec_x)
-        cq_line_y = cadquery.Edge.makeLine(cq_origin, cq_vec_y)
-        cq_line_z = cadquery.Edge.makeLine(cq_origin, cq_vec_z)
-
-        line_x = cq_line_x.rotate(cq_origin, cq_vec_z, rz).rotate(cq_origin, cq_vec_x, rx).rotate(cq_origin, cq_vec_y, ry)
-        line_y = cq_line_y.rotate(cq_origin, cq_vec_z, rz).rotate(cq_origin, cq_vec_x, rx).rotate(cq_origin, cq_vec_y, ry)
-        line_z = cq_line_z.rotate(cq_origin, cq_vec_z, rz).rotate(cq_origin, cq_vec_x, rx).rotate(cq_origin, cq_vec_y, ry)
-
-        self.relative_cartesian.update_axes(line_x.tangentAt(0).toTuple(), line_y.tangentAt(0).toTuple(), line_z.tangentAt(0).toTuple())
+        if len(planes) < 1:
+            return
+        rotations, inverse = numpy.unique(numpy.array([plane.total_rotation for plane in planes], dtype=float), axis=0, return_inverse=True)
+        matrices = cardinal_rotation_matrices(rotations)
+        for plane, index in zip(planes, inverse.reshape(-1)):
+            matrix = matrices[index]
+            plane.relative_cartesian.update_axes(tuple(matrix[:, 0].tolist()), tuple(matrix[:, 1].tolist()), tuple(matrix[:, 2].tolist()))
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -291,32 +293,55 @@ class KeyBaseMixin(object):
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
+class PostComputeStatistics(object):
+    """
+    Number of keys placed by CadKeyMixin.final_post_compute and the accumulated wall time.
+    """
+
+    def __init__(self):
+        self.keys = 0  # type: int
+        self.seconds = 0.0  # type: float
+
+    def counters(self) -> Tuple[int, float]:
+        return self.keys, self.seconds
+
+    def add_counters(self, before: Tuple[int, float], after: Tuple[int, float]) -> None:
+        """
+        Adds the keys placed meanwhile by another process (see: counters).
+        """
+        self.keys += after[0] - before[0]
+        self.seconds += after[1] - before[1]
+
+
+POST_COMPUTE_STATISTICS = PostComputeStatistics()
+
+
 class CadKeyMixin(object):
+    """
+    The key components are computed at the coordinate origin, then placed by one composed transformation (see: placement_location).
+    The components are moved by location: the geometry of cached components is shared, not copied.
+    """
 
-    def post_compute_cad_key_base(self: Key) -> None:
+    def placement_location(self: Key) -> cadquery.Location:
+        """
+        @return: rotation around the relative z, then x, then y-axis through the origin followed by the total translation
+        """
         origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
-        self.base._cad_object = self.base.get_cad_object() \
-            .rotate(origin, relative.z_axis, rz) \
-            .rotate(origin, relative.x_axis, rx) \
-            .rotate(origin, relative.y_axis, ry) \
-            .translate(tuple(self.base.total_translation))
-        self.base._cad_object = self.base.get_cad_object()
-
-    def post_compute_key_name(self: Key) -> cadquery.Workplane:
-        o = self.object_cache.get("name", self.name)
-        if o is None:
-            origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
-            o = self.base.get_cad_object().faces() \
-                .text(self.name, 5, 1).faces("<Z").wires() \
-                .rotate(origin, relative.z_axis, rz) \
-                .rotate(origin, relative.x_axis, rx) \
-                .rotate(origin, relative.y_axis, ry)
-            self.object_cache.store(o, "name", self.name)
+        transformation = gp_Trsf()
+        transformation.SetTranslation(gp_Vec(*self.base.total_translation))
+        for axis, angle in ((relative.y_axis, ry), (relative.x_axis, rx), (relative.z_axis, rz)):
+            if angle != 0:
+                rotation = gp_Trsf()
+                rotation.SetRotation(gp_Ax1(gp_Pnt(*origin), gp_Dir(*axis)), math.radians(angle))
+                transformation.Multiply(rotation)
+        return cadquery.Location(transformation)
 
-        return o.translate(tuple(self.base.total_translation))
+    @staticmethod
+    def place(obj: cadquery.Workplane, location: cadquery.Location) -> cadquery.Workplane:
+        return obj.newObject([o.moved(location) if isinstance(o, cadquery.Shape) else o for o in obj.objects])
 
     def post_compute_key_origin(self: Key) -> cadquery.Workplane:
-        o = self.object_cache.get("origin", self.name)
+        o = self.object_cache.get("origin", self.name, self.base.total_rotation)
         if o is None:
             origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
             o = self.base.get_cad_object().faces() \
@@ -324,49 +349,28 @@ class CadKeyMixin(object):
                 .rotate(origin, relative.z_axis, rz) \
                 .rotate(origin, relative.x_axis, rx) \
                 .rotate(origin, relative.y_axis, ry)
-            self.object_cache.store(o, "origin", self.name)
+            self.object_cache.store(o, "origin", self.name, self.base.total_rotation)
 
         return o.translate(tuple(self.base.total_translation))
 
-    def post_compute_cad_cap(self: Key):
-        origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
-        self.cap._cad_object = self.cap.get_cad_object() \
-            .rotate(origin, relative.z_axis, rz) \
-            .rotate(origin, relative.x_axis, rx) \
-            .rotate(origin, relative.y_axis, ry) \
-            .translate(tuple(self.base.total_translation))
-        self.cap._cad_object = self.cap.get_cad_object()
-
-    def post_compute_cad_slot(self: Key) -> None:
-        origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
-        self.slot._cad_object = self.slot.get_cad_object() \
-            .rotate(origin, relative.z_axis, rz) \
-            .rotate(origin, relative.x_axis, rx) \
-            .rotate(origin, relative.y_axis, ry) \
-            .translate(tuple(self.base.total_translation))
-        self.slot._cad_object = self.slot.get_cad_object()
-
-    def post_compute_cad_switch(self: Key) -> None:
-        origin, relative, (rx, ry, rz) = self.base.ABSOLUTE_CARTESIAN.origin, self.base.relative_cartesian, self.base.total_rotation
-        self.switch._cad_object = self.switch.get_cad_object() \
-            .rotate(origin, relative.z_axis, rz) \
-            .rotate(origin, relative.x_axis, rx) \
-            .rotate(origin, relative.y_axis, ry) \
-            .translate(tuple(self.base.total_translation))
-        self.switch._cad_object = self.switch.get_cad_object()
-
     def final_post_compute(self: Key):
-        self.post_compute_cad_key_base()
+        begin = perf_counter()
+        location = self.placement_location()
+
+        self.base.set_cad_object(self.place(self.base.get_cad_object(), location))
 
         if DEBUG.render_name:
-            self.cad_objects.name = self.post_compute_key_name()
+            self.cad_objects.name = self.place(KeyLabel(self.object_cache).compose(self.name), location)
         if DEBUG.render_origin:
             self.cad_objects.origin = self.post_compute_key_origin()
 
-        self.post_compute_cad_cap()
-        self.post_compute_cad_slot()
+        self.cap.set_cad_object(self.place(self.cap.get_cad_object(), location))
+        self.slot.set_cad_object(self.place(self.slot.get_cad_object(), location))
         if self.switch.has_cad_object():
-            self.post_compute_cad_switch()
+            self.switch.set_cad_object(self.place(self.switch.get_cad_object(), location))
+
+        POST_COMPUTE_STATISTICS.keys += 1
+        POST_COMPUTE_STATISTICS.seconds += perf_counter() - begin
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
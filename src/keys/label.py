@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import cadquery
+from OCP.Font import Font_FontMgr, Font_FontAspect, Font_TextFormatter
+from OCP.Graphic3d import Graphic3d_HTA_LEFT, Graphic3d_VTA_BOTTOM
+from OCP.NCollection import NCollection_Utf8String
+from OCP.StdPrs import StdPrs_BRepFont
+from OCP.TCollection import TCollection_AsciiString
+
+if TYPE_CHECKING:
+    from .object_cache import ObjectCache
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class LabelFont(object):
+    """
+    Glyph rendering and layout of the label font.
+    The font is looked up and laid out the same way as cadquery's text() does: Font_BRepTextBuilder's default alignment (left, bottom),
+    each glyph at the pen position of the text formatter.
+    """
+
+    def __init__(self, size: float, font: str = "Arial"):
+        self.size = size  # type: float
+        system_font = Font_FontMgr.GetInstance_s().FindFont(TCollection_AsciiString(font), Font_FontAspect.Font_FA_Regular)
+        self._font = StdPrs_BRepFont(NCollection_Utf8String(system_font.FontName().ToCString()), Font_FontAspect.Font_FA_Regular, float(size))
+
+    def render(self, char: str) -> cadquery.Shape:
+        """
+        @return: the glyph's flat faces at the pen origin, as placed by Font_BRepTextBuilder before the pen offset
+        """
+        return cadquery.Shape.cast(self._font.RenderGlyph(ord(char)))
+
+    def layout(self, text: str) -> List[Tuple[float, float]]:
+        """
+        @return: the pen position of each character (including kerning), as used by Font_BRepTextBuilder
+        """
+        formatter = Font_TextFormatter()
+        formatter.SetupAlignment(Graphic3d_HTA_LEFT, Graphic3d_VTA_BOTTOM)
+        formatter.Append(NCollection_Utf8String(text), self._font.FTFont())
+        formatter.Format()
+
+        scale = self._font.Scale()
+        return [(formatter.TopLeft(i).x() * scale, formatter.TopLeft(i).y() * scale) for i in range(len(text))]
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class KeyLabel(object):
+    """
+    Key labels composed of cached glyphs.
+
+    Each character's outline is rendered once at the pen origin, not rotated and cached in the "glyph" namespace.
+    A label places its glyphs at the pen positions of the text layout and is then centered by its bounding box as text() does;
+    rotation and translation are left to the caller (see: CadKeyMixin.final_post_compute).
+    The result matches the bottom face wires of cadquery's text(label, size, height) up to the bounding box tolerance
+    (see: benchmarks/label.py).
+    """
+
+    cache_namespace = "glyph"
+
+    _fonts = dict()  # type: Dict[float, LabelFont]
+
+    def __init__(self, cache: ObjectCache, size: float = 5, height: float = 1):
+        self.cache = cache  # type: ObjectCache
+        self.size = size  # type: float
+        self.height = height  # type: float
+
+    def font(self) -> LabelFont:
+        font = KeyLabel._fonts.get(self.size, None)
+        if font is None:
+            font = LabelFont(self.size)
+            KeyLabel._fonts[self.size] = font
+        return font
+
+    def glyph(self, char: str) -> cadquery.Workplane:
+        """
+        @return: the wires of the character's outline at the pen origin; flat, thus independent of the label height
+        """
+        o = self.cache.get(self.cache_namespace, char, self.size)
+        if o is None:
+            o = cadquery.Workplane().add(self.font().render(char).Wires())
+            self.cache.store(o, self.cache_namespace, char, self.size)
+        return o
+
+    def compose(self, text: str) -> cadquery.Workplane:
+        """
+        @return: the label's wires centered at the origin the same way as text() centers the rendered text
+        """
+        wires = list()  # type: List[cadquery.Shape]
+        for char, (x, y) in zip(text, self.font().layout(text)):
+            if not char.isspace():
+                offset = cadquery.Location(cadquery.Vector(x, y, 0))
+                wires.extend(shape.moved(offset) for shape in self.glyph(char).vals())
+        if len(wires) < 1:
+            return cadquery.Workplane()
+
+        # text(): translated by half the bounding box length, not by its center
+        box = cadquery.Compound.makeCompound(wires).BoundingBox()
+        center = cadquery.Location(cadquery.Vector(-box.xlen / 2, -box.ylen / 2, 0))
+        return cadquery.Workplane().add([wire.moved(center) for wire in wires])
@@ -0,0 +1,394 @@
+import hashlib
+import itertools
+import math
+import numbers
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, List, Optional, Any, Tuple, Hashable
+
+import cadquery
+
+from src.cfg.debug import DebugConfig
+from src.cfg.perf import PerfConfig
+from .brep import workplane_to_brep, workplane_from_brep
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class DiskObjectCache(object):
+    """
+    Persistent, content addressed storage of cad objects as binary BREP files.
+
+    The file name is the digest of the object's parameters, thus equal parameters always map to the same file.
+    Files are written to a temporary file first and then renamed atomically:
+    several processes may share the same directory without reading partially written objects.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory  # type: str
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], "{}.brep".format(digest))
+
+    def load(self, digest: str) -> Optional[Tuple[cadquery.Workplane, int]]:
+        """
+        @return: the object and its BREP size or None if not cached
+        """
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            return workplane_from_brep(data), len(data)
+        except Exception as e:
+            print("discarding unreadable cache file {}: {}".format(path, e))
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+    def save(self, digest: str, data: bytes) -> None:
+        """
+        @param digest: content address of the object
+        @param data: the object serialized as binary BREP (see: workplane_to_brep)
+        """
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class CacheKey(object):
+    """
+    Canonical cache key: a namespace plus a tuple of parameter values.
+
+    Floating point values are quantized to multiples of the tolerance so that numerical noise
+    (i.e. 17.999999999 vs. 18.0) maps to the same key.
+    Nested tuples/lists are quantized element wise, enums and types are reduced to their names.
+    The raw (un-quantized) values are kept for near-miss reporting only, they are not part of hash or equality.
+    """
+
+    def __init__(self, namespace: str, values: Tuple[Any, ...], tolerance: float):
+        self.namespace = namespace  # type: str
+        self.tolerance = tolerance  # type: float
+        self.raw_values = values  # type: Tuple[Any, ...]
+        self.values = CacheKey._quantize(values, tolerance)  # type: Tuple[Hashable, ...]
+        self._hash = hash((self.namespace, self.values))  # type: int
+
+    @staticmethod
+    def _quantize(value: Any, tolerance: float) -> Hashable:
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return value
+        elif isinstance(value, numbers.Real):
+            return int(round(float(value) / tolerance))
+        elif isinstance(value, (tuple, list)):
+            return tuple(CacheKey._quantize(v, tolerance) for v in value)
+        elif isinstance(value, Enum):
+            return value.name
+        elif isinstance(value, type):
+            return value.__qualname__
+        else:
+            raise TypeError("unsupported cache key value: {!r}".format(value))
+
+    @staticmethod
+    def _distance(a: Hashable, b: Hashable) -> Optional[int]:
+        """
+        @return: max. distance in quanta in between two quantized values or None if they differ in anything but quantized numbers
+        """
+        if isinstance(a, int) and isinstance(b, int) and not isinstance(a, bool) and not isinstance(b, bool):
+            return abs(a - b)
+        elif isinstance(a, tuple) and isinstance(b, tuple) and len(a) == len(b):
+            distances = [CacheKey._distance(x, y) for x, y in zip(a, b)]
+            return None if None in distances else max(distances, default=0)
+        else:
+            return 0 if a == b else None
+
+    def distance(self, other: "CacheKey") -> Optional[int]:
+        if self.namespace != other.namespace:
+            return None
+        return CacheKey._distance(self.values, other.values)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, CacheKey) and self.namespace == other.namespace and self.values == other.values
+
+    def __repr__(self) -> str:
+        return "({}){}".format(self.namespace, self.values)
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class CacheEntry(object):
+    """
+    Cached object plus a rough estimate of its size.
+    """
+
+    def __init__(self, obj: cadquery.Workplane, namespace: str, brep_size: int):
+        self.obj = obj  # type: cadquery.Workplane
+        self.namespace = namespace  # type: str
+        shapes = [v for v in obj.vals() if isinstance(v, cadquery.Shape)]
+        self.num_faces = sum(len(s.Faces()) for s in shapes)  # type: int
+        self.num_edges = sum(len(s.Edges()) for s in shapes)  # type: int
+        self.brep_size = brep_size  # type: int
+
+
+class CacheStatistics(object):
+
+    def __init__(self):
+        self.hits = 0  # type: int
+        self.disk_hits = 0  # type: int
+        self.weak_hits = 0  # type: int
+        self.misses = 0  # type: int
+        self.near_misses = 0  # type: int
+        self.evictions = 0  # type: int
+        self.entries = 0  # type: int
+        self.num_faces = 0  # type: int
+        self.num_edges = 0  # type: int
+        self.brep_size = 0  # type: int
+
+    def add(self, entry: CacheEntry) -> None:
+        self.entries += 1
+        self.num_faces += entry.num_faces
+        self.num_edges += entry.num_edges
+        self.brep_size += entry.brep_size
+
+    def remove(self, entry: CacheEntry) -> None:
+        self.entries -= 1
+        self.num_faces -= entry.num_faces
+        self.num_edges -= entry.num_edges
+        self.brep_size -= entry.brep_size
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class ObjectCache(object):
+    """
+    A naive cache implementation to reduce multiple computation of the same object.
+    Mainly used fot 3D CadQuery objects.
+
+    The in-memory cache is bounded (number of entries and accumulated BREP size) and evicts the least recently used entries first.
+    Evicted objects are kept in an optional weak reference tier as long as they are referenced elsewhere (i.e. by a key).
+
+    The in-memory cache is backed by an optional persistent disk cache (see: DiskObjectCache).
+    The disk cache is keyed by a digest of the namespace, the object's parameters and the config section registered for the namespace,
+    so that a config change never returns a stale object.
+
+    Objects are addressed by a namespace plus parameter values (see: CacheKey); pass the values as they are, not formatted as strings.
+    Misses whose parameters differ only slightly from each other are reported as near misses along with the statistics:
+    they usually indicate numerical noise above the key tolerance.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, config: DebugConfig, perf_config: PerfConfig):
+        self.container = OrderedDict()  # type: OrderedDict[CacheKey, CacheEntry]
+        self.weak_container = weakref.WeakValueDictionary() if perf_config.object_cache_weak_tier else None  # type: Optional[weakref.WeakValueDictionary]
+        self.weak_brep_sizes = dict()  # type: Dict[CacheKey, int]
+        self.namespaces = dict()  # type: Dict[str, Tuple[Any, ...]]
+        self.tolerances = dict()  # type: Dict[str, float]
+        self.statistics = dict()  # type: Dict[str, CacheStatistics]
+        self.enabled = not config.disable_object_cache
+        self.max_entries = perf_config.object_cache_max_entries  # type: int
+        self.max_brep_size = perf_config.object_cache_max_brep_size  # type: float
+        self.brep_size = 0  # type: int
+        self.key_tolerance = perf_config.cache_key_tolerance  # type: float
+        self.near_miss_quanta = perf_config.cache_key_near_miss_quanta  # type: int
+        self.missed = OrderedDict()  # type: OrderedDict[CacheKey, None]
+        self.missed_total = 0  # type: int
+        self.disk = DiskObjectCache(perf_config.disk_cache_dir) if self.enabled and perf_config.use_disk_cache else None  # type: Optional[DiskObjectCache]
+
+    def register_namespace(self, namespace: str, *config_sections: Any, tolerance: Optional[float] = None) -> None:
+        """
+        @param namespace: the first cache attribute, i.e. "cap" or "slot"
+        @param config_sections: config objects whose attributes influence the objects of this namespace (part of the disk cache digest)
+        @param tolerance: key tolerance of this namespace if it differs from the cache's key tolerance (see: CacheKey)
+        """
+        self.namespaces[namespace] = config_sections
+        if tolerance is not None:
+            self.tolerances[namespace] = tolerance
+        self.statistics.setdefault(namespace, CacheStatistics())
+
+    def _statistics(self, namespace: str) -> CacheStatistics:
+        return self.statistics.setdefault(namespace, CacheStatistics())
+
+    def tolerance(self, namespace: str) -> float:
+        return self.tolerances.get(namespace, self.key_tolerance)
+
+    def cache_key(self, namespace: str, *values: Any) -> CacheKey:
+        return CacheKey(namespace, values, self.tolerance(namespace))
+
+    def digest(self, key: CacheKey) -> str:
+        config_items = [sorted(vars(section).items()) for section in self.namespaces.get(key.namespace, ())]
+        fingerprint = repr((ObjectCache.FORMAT_VERSION, cadquery.__version__, key.tolerance, repr(key), config_items))
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def near_misses(self) -> List[Tuple[CacheKey, CacheKey]]:
+        """
+        Compares the missed keys once per namespace, i.e. when the statistics are printed, not on every lookup.
+        Objects are usually stored after a miss, thus a near miss of two missed keys is a near miss of a lookup vs. a cached key.
+        @return: pairs of missed keys that differ by at most near_miss_quanta, each key paired with the first such key missed before
+        """
+        by_namespace = dict()  # type: Dict[str, List[CacheKey]]
+        for key in self.missed:
+            by_namespace.setdefault(key.namespace, list()).append(key)
+
+        pairs = list()  # type: List[Tuple[CacheKey, CacheKey]]
+        for keys in by_namespace.values():
+            for i, key in enumerate(keys):
+                for other in keys[:i]:
+                    distance = key.distance(other)
+                    if distance is not None and 0 < distance <= self.near_miss_quanta:
+                        pairs.append((key, other))
+                        break
+        return pairs
+
+    def _insert(self, key: CacheKey, entry: CacheEntry) -> None:
+        self._remove(key)
+        self.container[key] = entry
+        self.brep_size += entry.brep_size
+        self._statistics(entry.namespace).add(entry)
+
+        while len(self.container) > 1 and (len(self.container) > self.max_entries or self.brep_size > self.max_brep_size):
+            evicted_key, evicted = next(iter(self.container.items()))
+            self._remove(evicted_key)
+            self._statistics(evicted.namespace).evictions += 1
+            if self.weak_container is not None:
+                self.weak_container[evicted_key] = evicted.obj
+                self.weak_brep_sizes[evicted_key] = evicted.brep_size
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self.container.pop(key, None)
+        if entry is not None:
+            self.brep_size -= entry.brep_size
+            self._statistics(entry.namespace).remove(entry)
+
+    def store(self, obj: cadquery.Workplane, namespace: str, *values: Any) -> None:
+        if not self.enabled:
+            return
+        key = self.cache_key(namespace, *values)
+
+        # serializing is as expensive as the lookups it saves: only if the size is bounded or the object is persisted
+        data = workplane_to_brep(obj) if self.disk is not None or self.max_brep_size < math.inf else None
+        self._insert(key, CacheEntry(obj, namespace, len(data) if data is not None else 0))
+
+        if self.disk is not None:
+            self.disk.save(self.digest(key), data)
+
+    def get(self, namespace: str, *values: Any) -> Optional[cadquery.Workplane]:
+        if not self.enabled:
+            return None
+
+        statistics = self._statistics(namespace)
+        key = self.cache_key(namespace, *values)
+        if key in self.container:
+            self.container.move_to_end(key)
+            statistics.hits += 1
+            return self.container[key].obj
+
+        if self.weak_container is not None:
+            obj = self.weak_container.get(key, None)
+            brep_size = self.weak_brep_sizes.pop(key, 0)
+            if obj is not None:
+                statistics.weak_hits += 1
+                self._insert(key, CacheEntry(obj, namespace, brep_size))
+                return obj
+
+        if self.disk is not None:
+            loaded = self.disk.load(self.digest(key))
+            if loaded is not None:
+                obj, brep_size = loaded
+                statistics.disk_hits += 1
+                self._insert(key, CacheEntry(obj, namespace, brep_size))
+                return obj
+
+        statistics.misses += 1
+        if self.near_miss_quanta > 0:
+            self._add_missed(key)
+        return None
+
+    LOOKUP_COUNTERS = ("hits", "disk_hits", "weak_hits", "misses")
+
+    def lookup_counters(self) -> Dict[str, Tuple[int, ...]]:
+        """
+        @return: lookup counters per namespace, i.e. to report lookups done by worker processes (see: add_lookup_counters)
+        """
+        return {namespace: tuple(getattr(s, c) for c in ObjectCache.LOOKUP_COUNTERS) for namespace, s in self.statistics.items()}
+
+    def add_lookup_counters(self, before: Dict[str, Tuple[int, ...]], after: Dict[str, Tuple[int, ...]]) -> None:
+        """
+        Adds the lookups in between two snapshots of another cache instance to this cache's statistics.
+        """
+        for namespace, counters in after.items():
+            statistics = self._statistics(namespace)
+            previous = before.get(namespace, (0,) * len(counters))
+            for counter, value, previous_value in zip(ObjectCache.LOOKUP_COUNTERS, counters, previous):
+                setattr(statistics, counter, getattr(statistics, counter) + value - previous_value)
+
+    def missed_keys(self, since: int = 0) -> List[CacheKey]:
+        """
+        @param since: missed_total already known, i.e. to report the misses of worker processes (see: add_missed_keys)
+        @return: the distinct missed keys added since then and still kept, in the order of their first miss
+        """
+        count = min(self.missed_total - since, len(self.missed))
+        return list(itertools.islice(self.missed, len(self.missed) - count, None))
+
+    def add_missed_keys(self, keys: List[CacheKey]) -> None:
+        for key in keys:
+            self._add_missed(key)
+
+    def _add_missed(self, key: CacheKey) -> None:
+        """
+        Keeps the last max_entries distinct missed keys (see: near_misses).
+        """
+        if key in self.missed:
+            return
+        self.missed[key] = None
+        self.missed_total += 1
+        while len(self.missed) > self.max_entries:
+            self.missed.popitem(last=False)
+
+    def print_statistics(self) -> None:
+        near_misses = self.near_misses()
+        for s in self.statistics.values():
+            s.near_misses = 0
+        for key, _ in near_misses:
+            self._statistics(key.namespace).near_misses += 1
+
+        print("object cache ({}):".format("enabled" if self.enabled else "disabled"))
+        print("  namespace       │  hits  disk  weak  miss  near evict│entries  faces  edges  BREP kB")
+        print("  ────────────────┼────────────────────────────────────┼─────────────────────────────")
+        for namespace, s in self.statistics.items():
+            print("  {namespace:16}│{hits:6}{disk:6}{weak:6}{misses:6}{near:6}{evictions:6}│{entries:7}{faces:7}{edges:7}{size:9,.0f}".format(
+                namespace=namespace, hits=s.hits, disk=s.disk_hits, weak=s.weak_hits, misses=s.misses, near=s.near_misses, evictions=s.evictions,
+                entries=s.entries, faces=s.num_faces, edges=s.num_edges, size=s.brep_size / 1024))
+        print("  total: {} of max. {} entries, {:,.0f} of max. {:,.0f} kB".format(
+            len(self.container), self.max_entries, self.brep_size / 1024, self.max_brep_size / 1024))
+        if len(near_misses) > 0:
+            print("  near misses (numerical noise above the key tolerance):")
+            for key, other in near_misses:
+                print("    {} (tolerance {}): {} vs. {}".format(key.namespace, key.tolerance, key.raw_values, other.raw_values))
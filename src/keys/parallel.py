@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import multiprocessing
+from multiprocessing import resource_tracker
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Callable, Any
+
+from .transport import send_shape, receive_shape, send_placed_shape, receive_placed_shape
+from .boolean import BOOLEAN_STATISTICS
+from .key_mixins import POST_COMPUTE_STATISTICS
+
+if TYPE_CHECKING:
+    from .key import Key
+    from .object_cache import CacheKey
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def effective_jobs(jobs: int) -> int:
+    """
+    @param jobs: number of worker processes, 0 for one process per cpu core
+    """
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def process_pool(jobs: int, initializer: Optional[Callable[..., None]] = None, initargs: Tuple[Any, ...] = ()) -> ProcessPoolExecutor:
+    """
+    Workers are forked where supported: they inherit the imported layout, config and cli arguments.
+    Otherwise they are spawned and re-import the modules from the same command line: the entry script is imported as __mp_main__
+    and must not run its top-level code then (see: main.py).
+    The resource tracker is started beforehand so that forked workers share it: shared memory blocks created by a worker
+    and released by the main process (see: receive_shape) are then tracked by one process only.
+    """
+    resource_tracker.ensure_running()
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=effective_jobs(jobs), mp_context=context, initializer=initializer, initargs=initargs)
+
+
+def parallel_map(function: Callable[[Any], Any], items: List[Any], jobs: int) -> List[Any]:
+    """
+    Maps the items by a process pool.
+    @param function: module level function; arguments and results must be picklable (i.e. cad objects by send_shape)
+    @return: the results in the order of the items
+    """
+    with process_pool(jobs) as executor:
+        return list(executor.map(function, items))
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def _compute_key(key: Key) -> Tuple[Dict[str, Any], Tuple[Tuple, Tuple], List[CacheKey]]:
+    """
+    Worker: computes the key's cad objects and returns them for transport (see: send_shape, send_placed_shape)
+    plus the counters of object cache lookups, boolean operations and placed keys before and after and the keys missed meanwhile.
+    """
+    missed = key.object_cache.missed_total
+    counters_before = key.object_cache.lookup_counters(), BOOLEAN_STATISTICS.counters(), POST_COMPUTE_STATISTICS.counters()
+    key.compute(index_topology=False)
+    breps = {
+        "base": send_placed_shape(key.base.get_cad_object()),
+        "cap": send_placed_shape(key.cap.get_cad_object()),
+        "slot": send_placed_shape(key.slot.get_cad_object()),
+        "switch": send_placed_shape(key.switch.get_cad_object()) if key.switch.has_cad_object() else None,
+        "name": send_shape(key.cad_objects.name),
+        "origin": send_shape(key.cad_objects.origin),
+    }
+    counters_after = key.object_cache.lookup_counters(), BOOLEAN_STATISTICS.counters(), POST_COMPUTE_STATISTICS.counters()
+    return breps, (counters_before, counters_after), key.object_cache.missed_keys(missed)
+
+
+def _restore_key(key: Key, breps: Dict[str, Any], prototypes: Dict[bytes, Any]) -> None:
+    """
+    The slot's topology index refers to the worker's shapes, thus it is built for the received slot (see: Key.compute).
+    @param prototypes: components computed by several workers are shared (see: receive_placed_shape)
+    """
+    key.base.set_cad_object(receive_placed_shape(breps["base"], prototypes))
+    key.cap.set_cad_object(receive_placed_shape(breps["cap"], prototypes))
+    key.slot.set_cad_object(receive_placed_shape(breps["slot"], prototypes))
+    key.slot.build_topology_index(key.base.relative_cartesian)
+    key.switch.set_cad_object(receive_placed_shape(breps["switch"], prototypes))
+    key.cad_objects.name = receive_shape(breps["name"])
+    key.cad_objects.origin = receive_shape(breps["origin"])
+    key.expose_cad_objects()
+
+
+def compute_cad_objects(key_matrix: List[List[Key]], jobs: int, selected: Optional[Set[Tuple[int, int]]] = None) -> None:
+    """
+    Computes the cad objects of all keys; the key placement must be final.
+
+    With more than one job the keys are computed by a process pool.
+    Results are merged back in row/column order, thus the outcome does not depend on the number of jobs or the scheduling.
+    Workers share cached objects by means of the disk cache only; their cache lookups and boolean operations are added to the main process' statistics.
+
+    @param key_matrix: keys with final placement
+    @param jobs: number of worker processes (see: PerfConfig.jobs)
+    @param selected: (row, column) of the keys to compute, None for all; the other keys are left without cad objects
+    """
+    keys = [key for row_idx, row in enumerate(key_matrix) for col_idx, key in enumerate(row)
+            if selected is None or (row_idx, col_idx) in selected]  # type: List[Key]
+    if effective_jobs(jobs) <= 1 or len(keys) <= 1:
+        for key in keys:
+            key.compute()
+        return
+
+    prototypes = dict()  # type: Dict[bytes, Any]
+    with process_pool(jobs) as executor:
+        for key, (breps, (counters_before, counters_after), missed) in zip(keys, executor.map(_compute_key, keys)):
+            _restore_key(key, breps, prototypes)
+            key.object_cache.add_lookup_counters(counters_before[0], counters_after[0])
+            key.object_cache.add_missed_keys(missed)
+            BOOLEAN_STATISTICS.add_counters(counters_before[1], counters_after[1])
+            POST_COMPUTE_STATISTICS.add_counters(counters_before[2], counters_after[2])
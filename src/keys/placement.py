@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+import numpy
+
+if TYPE_CHECKING:
+    from .key import Key
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+# column index of the clearance array
+CLEARANCE_LEFT, CLEARANCE_RIGHT, CLEARANCE_BOTTOM, CLEARANCE_TOP = 0, 1, 2, 3
+
+
+def chain_positions(row_index: numpy.ndarray,
+                    row_starts: numpy.ndarray,
+                    width: numpy.ndarray,
+                    depth: numpy.ndarray,
+                    clearance: numpy.ndarray,
+                    origin_y: numpy.ndarray) -> numpy.ndarray:
+    """
+    Planar ISO placement of keys in rows (see: KeyUtils.set_position_relative_to, KeyBaseMixin.align_to_position):
+      - the first key of each row is left aligned to x = 0,
+      - each other key is right of its predecessor,
+      - each row is on top of the row below w.r.t. the first key of both rows.
+    Rows and columns are chained by cumulative sums; leading dimensions of the parameters (i.e. a parameter sweep) are kept.
+
+    @param row_index: n row indices, one per key
+    @param row_starts: index of the first key per row
+    @param width: ... × n widths of the key bases
+    @param depth: ... × n depths of the key bases
+    @param clearance: ... × n × 4 clearances (see: CLEARANCE_LEFT etc.)
+    @param origin_y: ... y-position of the first row
+    @return: ... × n × 2 positions (x, y)
+    """
+    half_width, half_depth = width / 2, depth / 2
+
+    # x: distance to the predecessor, restarted at each row's first key
+    step_x = numpy.empty_like(width)
+    step_x[..., 1:] = half_width[..., :-1] + clearance[..., :-1, CLEARANCE_RIGHT] + clearance[..., 1:, CLEARANCE_LEFT] + half_width[..., 1:]
+    step_x[..., row_starts] = half_width[..., row_starts]
+    x = numpy.cumsum(step_x, axis=-1)
+    x -= (x[..., row_starts] - step_x[..., row_starts])[..., row_index]
+
+    # y: distance of each row's first key to the first key of the row below
+    first_depth, first_clearance = half_depth[..., row_starts], clearance[..., row_starts, :]
+    step_y = numpy.empty_like(first_depth)
+    step_y[..., 0] = origin_y
+    step_y[..., 1:] = first_depth[..., :-1] + first_clearance[..., :-1, CLEARANCE_TOP] + first_clearance[..., 1:, CLEARANCE_BOTTOM] + first_depth[..., 1:]
+    y = numpy.cumsum(step_y, axis=-1)[..., row_index]
+
+    return numpy.stack([x, y], axis=-1)
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class PlacementTable(object):
+    """
+    Placement parameters of all keys as arrays (n: number of keys in row order):
+      - width, depth:      n; the key base dimension (see: KeyBase.update)
+      - clearance:         n × 4; see: CLEARANCE_LEFT etc.
+      - positions:         n × 3; solved by solve()
+
+    The key bases must be updated beforehand (see: Key.update).
+    """
+
+    def __init__(self, key_matrix: List[List[Key]]):
+        """
+        @raise ValueError: if a row has no keys
+        """
+        if any(len(row) < 1 for row in key_matrix):
+            raise ValueError("key matrix rows must have at least one key")
+        self.keys = [key for row in key_matrix for key in row]  # type: List[Key]
+        row_lengths = numpy.array([len(row) for row in key_matrix], dtype=int)
+        self.row_index = numpy.repeat(numpy.arange(len(key_matrix)), row_lengths)  # type: numpy.ndarray
+        self.row_starts = numpy.concatenate([[0], numpy.cumsum(row_lengths)[:-1]]).astype(int)  # type: numpy.ndarray
+
+        bases = [key.base for key in self.keys]
+        self.width = numpy.array([b.width for b in bases], dtype=float)  # type: numpy.ndarray
+        self.depth = numpy.array([b.depth for b in bases], dtype=float)  # type: numpy.ndarray
+        self.clearance = numpy.array([(b.clearance_left, b.clearance_right, b.clearance_bottom, b.clearance_top) for b in bases], dtype=float)  # type: numpy.ndarray
+        self.positions = numpy.array([b.position for b in bases], dtype=float).reshape(-1, 3)  # type: numpy.ndarray
+
+    def solve(self) -> None:
+        """
+        Computes the x/y-positions of all keys, z-positions are kept.
+        """
+        if len(self.keys) < 1:
+            return
+        origin_y = self.positions[self.row_starts[0], 1]
+        self.positions[:, :2] = chain_positions(self.row_index, self.row_starts, self.width, self.depth, self.clearance, origin_y)
+
+    def apply(self) -> None:
+        """
+        Writes the positions back to the key bases.
+        """
+        for key, position in zip(self.keys, self.positions.tolist()):
+            key.base.position = tuple(position)
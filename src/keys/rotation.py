@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import numpy
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def cardinal_rotation_matrices(total_rotations: numpy.ndarray) -> numpy.ndarray:
+    """
+    Closed form of the rotation around the absolute z, then x, then y-axis: R = Ry · Rx · Rz.
+    The columns of R are the rotated x, y and z-axis (see: KeyPlane.compute_relative_cardinal_rotations).
+
+    @param total_rotations: n × 3 rotations (x, y, z) in [deg]
+    @return: n × 3 × 3 rotation matrices
+    """
+    radians = numpy.radians(numpy.asarray(total_rotations, dtype=float).reshape(-1, 3))
+    cx, cy, cz = numpy.cos(radians).T
+    sx, sy, sz = numpy.sin(radians).T
+
+    matrices = numpy.empty((len(radians), 3, 3))
+    matrices[:, 0, 0] = cy * cz + sy * sx * sz
+    matrices[:, 0, 1] = sy * sx * cz - cy * sz
+    matrices[:, 0, 2] = sy * cx
+    matrices[:, 1, 0] = cx * sz
+    matrices[:, 1, 1] = cx * cz
+    matrices[:, 1, 2] = -sx
+    matrices[:, 2, 0] = cy * sx * sz - sy * cz
+    matrices[:, 2, 1] = sy * sz + cy * sx * cz
+    matrices[:, 2, 2] = cy * cx
+    return matrices
+
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, Tuple, Optional, Callable
+
+import cadquery
+from cadquery.selectors import Selector, AndSelector, InverseSelector, StringSyntaxSelector, \
+    DirectionMinMaxSelector, ParallelDirSelector, PerpendicularDirSelector, DirectionSelector
+
+if TYPE_CHECKING:
+    from .key_mixins import CartesianRoot
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class SelectorFactory(object):
+    """
+    Cache of compiled CadQuery selectors.
+
+    Selector templates use the placeholders {X}, {Y} and {Z} for the axes of a cartesian root, i.e. "|{Y}", ">{X} and |{Y}".
+    Selectors are cached per (orientation, template): keys sharing a rotation share their selectors.
+
+    Templates made of direction terms ("<", ">", "|", "#", "+", "-" followed by an axis placeholder), optionally negated with "not"
+    and joined with "and", are built directly from the axis vectors.
+    Any other template is formatted and parsed by CadQuery once and then cached as well.
+    """
+
+    TERM = re.compile(r"^(not )?([<>|#+-])\{([XYZ])\}$")
+
+    OPERATORS = {
+        "<": lambda v: DirectionMinMaxSelector(v, directionMax=False),
+        ">": lambda v: DirectionMinMaxSelector(v, directionMax=True),
+        "|": ParallelDirSelector,
+        "#": PerpendicularDirSelector,
+        "+": DirectionSelector,
+        "-": lambda v: DirectionSelector(-v),
+    }  # type: Dict[str, Callable[[cadquery.Vector], Selector]]
+
+    ABSOLUTE_AXES = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+    def __init__(self):
+        self.container = dict()  # type: Dict[Tuple[Tuple, str], Selector]
+        self.hits = 0  # type: int
+        self.misses = 0  # type: int
+
+    @staticmethod
+    def orientation(cartesian_root: Optional[CartesianRoot]) -> Tuple[Tuple[float, float, float], ...]:
+        """
+        @return: the axes of the cartesian root or the absolute axes if None
+        """
+        if cartesian_root is None:
+            return SelectorFactory.ABSOLUTE_AXES
+        return tuple(tuple(float(c) for c in axis) for axis in (cartesian_root.x_axis, cartesian_root.y_axis, cartesian_root.z_axis))
+
+    def get(self, template: str, cartesian_root: Optional[CartesianRoot] = None) -> Selector:
+        """
+        @param template: selector string with axis placeholders, i.e. "<{Z}"
+        @param cartesian_root: cartesian root whose axes replace the placeholders; absolute axes if None
+        """
+        axes = SelectorFactory.orientation(cartesian_root)
+        key = (tuple(tuple(round(c, 9) for c in axis) for axis in axes), template)
+        selector = self.container.get(key, None)
+        if selector is not None:
+            self.hits += 1
+            return selector
+
+        self.misses += 1
+        selector = self._compile(template, axes)
+        self.container[key] = selector
+        return selector
+
+    def _compile(self, template: str, axes: Tuple[Tuple[float, float, float], ...]) -> Selector:
+        vectors = {name: cadquery.Vector(*axis) for name, axis in zip("XYZ", axes)}
+        selector = None  # type: Optional[Selector]
+        for term in template.split(" and "):
+            match = SelectorFactory.TERM.match(term.strip())
+            if match is None:
+                return StringSyntaxSelector(template.format(**{name: "{}".format(axis) for name, axis in zip("XYZ", axes)}))
+            negate, operator, axis = match.groups()
+            term_selector = SelectorFactory.OPERATORS[operator](vectors[axis])
+            if negate:
+                term_selector = InverseSelector(term_selector)
+            selector = term_selector if selector is None else AndSelector(selector, term_selector)
+        return selector
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+SELECTORS = SelectorFactory()
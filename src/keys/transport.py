@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import cadquery
+from OCP.gp import gp_Trsf
+
+from .brep import write_workplane, read_workplane, workplane_to_brep, workplane_from_brep
+from src.cfg.perf import PERF
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+class SharedShape(object):
+    """
+    Handle of a workplane serialized as binary BREP into a shared memory block.
+    Only the handle is pickled when results are passed between processes; the block is owned by the receiver (see: receive_shape).
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name = name  # type: str
+        self.size = size  # type: int
+
+
+class _ChunkWriter(object):
+    """
+    Write-only stream for BinTools that keeps the chunks it is handed.
+    The BREP size is known only once written, thus the chunks are copied into the shared memory block afterwards:
+    one copy into the block, no intermediate buffer (i.e. BytesIO) in between.
+    """
+
+    def __init__(self):
+        self.chunks = list()  # type: List[bytes]
+        self.size = 0  # type: int
+
+    def write(self, data: bytes) -> int:
+        # OCP's stream adapter passes a new bytes object per chunk; anything else may be a view of a re-used buffer
+        self.chunks.append(data if isinstance(data, bytes) else bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+class _SharedMemoryReader(object):
+    """
+    Read-only stream over a shared memory block for BinTools.
+    No zero-copy read: OCP's stream adapter accepts bytes objects only (no memoryview, no readinto()),
+    thus each chunk read is copied out of the block once; there is no other copy in between.
+    """
+
+    def __init__(self, buffer: memoryview):
+        self.buffer = buffer  # type: memoryview
+        self.position = 0  # type: int
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self.buffer) if size is None or size < 0 else min(len(self.buffer), self.position + size)
+        data = self.buffer[self.position:end].tobytes()
+        self.position = end
+        return data
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def send_shape(obj: Optional[cadquery.Workplane]) -> Union[None, bytes, SharedShape]:
+    """
+    Serializes a workplane for passing it to another process according to PerfConfig.shape_transport.
+    @return: None for None, bytes for "bytes" transport, a SharedShape handle for "shared-memory" transport
+    """
+    if obj is None:
+        return None
+    if PERF.shape_transport == "bytes":
+        return workplane_to_brep(obj)
+    if PERF.shape_transport == "shared-memory":
+        stream = _ChunkWriter()
+        write_workplane(obj, stream)
+        block = shared_memory.SharedMemory(create=True, size=max(1, stream.size))
+        position = 0
+        for chunk in stream.chunks:
+            block.buf[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        handle = SharedShape(block.name, stream.size)
+        block.close()
+        return handle
+    assert False, "unknown shape transport: {}".format(PERF.shape_transport)
+
+
+def receive_shape(data: Union[None, bytes, SharedShape]) -> Optional[cadquery.Workplane]:
+    """
+    Restores a workplane passed by send_shape(); shared memory blocks are released afterwards.
+    """
+    if data is None:
+        return None
+    if isinstance(data, bytes):
+        return workplane_from_brep(data)
+    block = shared_memory.SharedMemory(name=data.name)
+    view = block.buf[:data.size]
+    try:
+        return read_workplane(_SharedMemoryReader(view))
+    finally:
+        view.release()
+        block.close()
+        block.unlink()
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
+def location_values(location: cadquery.Location) -> Tuple[float, ...]:
+    """
+    @return: the 3 × 4 transformation matrix in row order
+    """
+    transformation = location.wrapped.Transformation()
+    return tuple(transformation.Value(row, col) for row in (1, 2, 3) for col in (1, 2, 3, 4))
+
+
+def location_from_values(values: Tuple[float, ...]) -> cadquery.Location:
+    transformation = gp_Trsf()
+    transformation.SetValues(*values)
+    return cadquery.Location(transformation)
+
+
+def send_placed_shape(obj: Optional[cadquery.Workplane]) -> Optional[Tuple[Any, Optional[Tuple[float, ...]]]]:
+    """
+    Serializes a placed workplane (see: CadKeyMixin.place) as its shape without location plus the location:
+    objects moved from the same shape are sent as the same data, thus the receiver can share them (see: receive_placed_shape).
+    Workplanes of more than one shape are sent as they are.
+    """
+    if obj is None:
+        return None
+    shapes = obj.vals()
+    if len(shapes) != 1 or not isinstance(shapes[0], cadquery.Shape):
+        return send_shape(obj), None
+    return send_shape(cadquery.Workplane().add(shapes[0].located(cadquery.Location()))), location_values(shapes[0].location())
+
+
+def receive_placed_shape(data: Optional[Tuple[Any, Optional[Tuple[float, ...]]]], prototypes: Dict[bytes, cadquery.Workplane]) -> Optional[cadquery.Workplane]:
+    """
+    Restores a workplane passed by send_placed_shape().
+    @param prototypes: received shapes by their binary BREP, shared by all calls; only used for "bytes" transport
+    """
+    if data is None:
+        return None
+    shape_data, values = data
+    if values is None:
+        return receive_shape(shape_data)
+    if isinstance(shape_data, bytes):
+        if shape_data not in prototypes:
+            prototypes[shape_data] = receive_shape(shape_data)
+        prototype = prototypes[shape_data]
+    else:
+        prototype = receive_shape(shape_data)
+    return cadquery.Workplane().add(prototype.val().moved(location_from_values(values)))
+
+
+def send_assembly(assembly: cadquery.Assembly) -> Tuple[List[Any], List[Tuple[int, Tuple[float, ...], Optional[Tuple[float, ...]]]]]:
+    """
+    Serializes an assembly for passing it to another process as its distinct shapes plus (shape index, location, color) per part.
+    The hierarchy is flattened to the parts' absolute locations; parts of the same shape refer to the same data (see: receive_assembly).
+    """
+    shapes = dict()  # type: Dict[cadquery.Shape, int]
+    parts = list()  # type: List[Tuple[int, Tuple[float, ...], Optional[Tuple[float, ...]]]]
+
+    def flatten(node: cadquery.Assembly, location: cadquery.Location) -> None:
+        location = location * node.loc
+        if node.obj is not None:
+            for shape in node.obj.vals() if isinstance(node.obj, cadquery.Workplane) else [node.obj]:
+                index = shapes.setdefault(shape.located(cadquery.Location()), len(shapes))
+                parts.append((index, location_values(location * shape.location()), node.color.toTuple() if node.color is not None else None))
+        for child in node.children:
+            flatten(child, location)
+
+    flatten(assembly, cadquery.Location())
+    return [send_shape(cadquery.Workplane().add(shape)) for shape in shapes], parts
+
+
+def receive_assembly(data: Tuple[List[Any], List[Tuple[int, Tuple[float, ...], Optional[Tuple[float, ...]]]]]) -> cadquery.Assembly:
+    """
+    Restores an assembly passed by send_assembly(); each distinct shape is restored once and referred to by location.
+    """
+    shapes_data, parts = data
+    prototypes = [receive_shape(shape_data) for shape_data in shapes_data]
+    assembly = cadquery.Assembly()
+    for index, values, color in parts:
+        assembly = assembly.add(prototypes[index], loc=location_from_values(values), color=cadquery.Color(*color) if color is not None else None)
+    return assembly
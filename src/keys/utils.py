@@ -1,10 +1,50 @@
+from typing import Any
 from .key import *
+from .brep import workplane_to_brep, workplane_from_brep
+from .object_cache import CacheKey
+from .parallel import parallel_map, effective_jobs
+from .transport import send_shape, receive_shape
+from .fuse import fuse
+from .hull import merge_coplanar_faces
+from .board import BoardTransform
+from src.cfg.perf import PERF
 import cqmore
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
+class ConnectorTemplate(object):
+    """
+    A gap filler resolved to its template: the template is constructed in a local frame and placed at the anchor.
+
+    Resolving a filler (selecting points/faces) is cheap, constructing the template (hull or loft) is not,
+    thus fillers are resolved first and their templates are constructed in one batch (see: KeyUtils.build_connectors).
+
+    self.anchor: local frame origin in global coordinates (see: KeyUtils.to_local_frame)
+    self.kind: "hull", "loft" or "face-loft"
+    self.parameters: template parameters in the local frame; part of the object cache key (see: PerfConfig.connector_key_tolerance)
+    self.construct_args: input to construct the template (see: KeyUtils.construct_template); picklable
+    """
+
+    def __init__(self, anchor: cadquery.Vector, kind: str, parameters: Tuple[Any, ...], construct_args: Tuple[Any, ...]):
+        self.anchor = anchor  # type: cadquery.Vector
+        self.kind = kind  # type: str
+        self.parameters = (kind,) + parameters  # type: Tuple[Any, ...]
+        self.construct_args = construct_args  # type: Tuple[Any, ...]
+
+
+def _construct_template_shape(args: Tuple[Any, ...]) -> Any:
+    """
+    Worker: constructs a connector template and returns it for transport (see: send_shape) along with its face counts.
+    """
+    obj, face_counts = KeyUtils.construct_template(*args)
+    return send_shape(obj), face_counts
+
+
+# ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+
 class KeyUtils(object):
 
     @staticmethod
@@ -52,8 +92,102 @@ class KeyUtils(object):
 
         return cadquery.Workplane(cadquery.Solid.makeLoft([get_wire(first_face), get_wire(second_face)]))
 
+    @staticmethod
+    def to_local_frame(points: List[cadquery.Vector]) -> Tuple[cadquery.Vector, List[Tuple[float, float, float]]]:
+        """
+        Translates points into a local frame anchored at the minimum corner of their bounding box.
+        Point sets that are equal up to translation share the same local points.
+        @return: the anchor (local frame origin in global coordinates) and the points relative to the anchor
+        """
+        anchor = cadquery.Vector(min(p.x for p in points), min(p.y for p in points), min(p.z for p in points))
+        return anchor, [(p.x - anchor.x, p.y - anchor.y, p.z - anchor.z) for p in points]
+
+    @staticmethod
+    def place_template(template: cadquery.Workplane, anchor: cadquery.Vector) -> cadquery.Workplane:
+        """
+        Places a connector template constructed in its local frame.
+        The shapes are moved by location, thus the template geometry is shared and not copied.
+        """
+        location = cadquery.Location(anchor)
+        return cadquery.Workplane().add([shape.moved(location) for shape in template.vals()])
+
+    @staticmethod
+    def construct_template(kind: str, *construct_args: Any) -> Tuple[cadquery.Workplane, Tuple[int, int]]:
+        """
+        Constructs a connector template in its local frame (see: ConnectorTemplate).
+        @return: the template and the number of hull faces before and after merging coplanar faces (zero if not a hull)
+        """
+        if kind == "hull":
+            local_points, = construct_args
+            points, faces = cqmore.polyhedron.hull([cadquery.Vector(*point) for point in local_points])
+            points, polygons = merge_coplanar_faces(points, faces)
+            return cqmore.Workplane().polyhedron(points, polygons), (len(faces), len(polygons))
+        elif kind == "loft":
+            local_edges, = construct_args
+            return KeyUtils._loft_along_edges([(cadquery.Vector(*bottom), cadquery.Vector(*top)) for bottom, top in local_edges]), (0, 0)
+        elif kind == "face-loft":
+            local_wires, = construct_args
+            return cadquery.Workplane(cadquery.Solid.makeLoft(workplane_from_brep(local_wires).vals())), (0, 0)
+        else:
+            assert False
+
+    @staticmethod
+    def build_connectors(templates: List[ConnectorTemplate], jobs: int = 1) -> List[cadquery.Workplane]:
+        """
+        Gap fillers in a planar layout are mostly equal up to translation (i.e. gaps in between two 1u keys of a row).
+        Such fillers are constructed once in their local frame, cached as template and placed by translation.
+
+        Templates missing in the object cache are constructed once each, optionally by a process pool.
+        @param templates: resolved connectors
+        @param jobs: number of worker processes (see: PerfConfig.jobs)
+        @return: the placed connectors in the order of the templates
+        """
+        constructed = dict()  # type: Dict[CacheKey, cadquery.Workplane]
+        missing = dict()  # type: Dict[CacheKey, ConnectorTemplate]
+        for template in templates:
+            key = Key.object_cache.cache_key("connector", *template.parameters)
+            if key not in constructed and key not in missing:
+                cached = Key.object_cache.get("connector", *template.parameters)
+                if cached is not None:
+                    constructed[key] = cached
+                else:
+                    missing[key] = template
+
+        construct_args = [(template.kind,) + template.construct_args for template in missing.values()]
+        if effective_jobs(jobs) > 1 and len(construct_args) > 1:
+            results = [(receive_shape(data), face_counts) for data, face_counts in parallel_map(_construct_template_shape, construct_args, jobs)]
+        else:
+            results = [KeyUtils.construct_template(*args) for args in construct_args]
+
+        for (key, template), (obj, _) in zip(missing.items(), results):
+            Key.object_cache.store(obj, "connector", *template.parameters)
+            constructed[key] = obj
+
+        # face counts per constructed hull template, identified by its number, the connectors sharing it and the first one's anchor
+        uses = dict()  # type: Dict[CacheKey, int]
+        for template in templates:
+            key = Key.object_cache.cache_key("connector", *template.parameters)
+            uses[key] = uses.get(key, 0) + 1
+        for number, ((key, template), (_, (faces, merged))) in enumerate(zip(missing.items(), results)):
+            if template.kind == "hull":
+                print("\n  hull #{} ({} connectors, at {:.2f}, {:.2f}, {:.2f}): {} → {} faces".format(
+                    number, uses[key], template.anchor.x, template.anchor.y, template.anchor.z, faces, merged), end="")
+
+        return [KeyUtils.place_template(constructed[Key.object_cache.cache_key("connector", *template.parameters)], template.anchor)
+                for template in templates]
+
+    @staticmethod
+    def resolve_loft_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> ConnectorTemplate:
+        anchor, local_points = KeyUtils.to_local_frame([point for edge in bottom_top_points for point in edge])
+        local_edges = tuple(zip(local_points[0::2], local_points[1::2]))
+        return ConnectorTemplate(anchor, "loft", (local_edges,), (local_edges,))
+
     @staticmethod
     def loft_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> cadquery.Workplane:
+        return KeyUtils.build_connectors([KeyUtils.resolve_loft_along_edges(bottom_top_points)])[0]
+
+    @staticmethod
+    def _loft_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> cadquery.Workplane:
         bottom_top_tuples = [list(edge) for edge in list(zip(*bottom_top_points))]
         bottom_points = bottom_top_tuples[0]
         top_points = bottom_top_tuples[1]
@@ -74,21 +208,44 @@ class KeyUtils(object):
         return loft
 
     @staticmethod
-    def polyhedron_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> cqmore.Workplane:
+    def resolve_polyhedron_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> ConnectorTemplate:
         points = list()
         for edge in bottom_top_points:
             points.append(edge[0])
             points.append(edge[1])
-        return cqmore.Workplane().polyhedron(*cqmore.polyhedron.hull(points))
+        return KeyUtils.resolve_polyhedron_hull(points)
 
     @staticmethod
-    def key_face_connector(first_key: Key,
-                           second_key: Key,
-                           first_direction: Direction,
-                           second_direction: Direction,
-                           polyhedron_mode: bool) -> Union[cadquery.Workplane, cqmore.Workplane]:
+    def polyhedron_along_edges(bottom_top_points: List[Tuple[cadquery.Vector, cadquery.Vector]]) -> cadquery.Workplane:
+        return KeyUtils.build_connectors([KeyUtils.resolve_polyhedron_along_edges(bottom_top_points)])[0]
+
+    @staticmethod
+    def resolve_polyhedron_hull(points: List[cadquery.Vector]) -> ConnectorTemplate:
+        """
+        The hull does not depend on the point order, thus the local points are sorted and de-duplicated (w.r.t. the connector key tolerance)
+        to share the template in between all fillers of equal shape.
         """
-        Returns a loft/gap filler in between two key faces as specified the direction.
+        anchor, local_points = KeyUtils.to_local_frame(points)
+        tolerance = Key.object_cache.tolerance("connector")
+        unique_points = {tuple(round(c / tolerance) for c in point): point for point in local_points}
+        local_points = tuple(unique_points[k] for k in sorted(unique_points.keys()))
+        return ConnectorTemplate(anchor, "hull", (local_points,), (local_points,))
+
+    @staticmethod
+    def polyhedron_hull(points: List[cadquery.Vector]) -> cadquery.Workplane:
+        """
+        Returns the convex hull of the points.
+        """
+        return KeyUtils.build_connectors([KeyUtils.resolve_polyhedron_hull(points)])[0]
+
+    @staticmethod
+    def resolve_key_face_connector(first_key: Key,
+                                   second_key: Key,
+                                   first_direction: Direction,
+                                   second_direction: Direction,
+                                   polyhedron_mode: bool) -> ConnectorTemplate:
+        """
+        Resolves a loft/gap filler in between two key faces as specified the direction.
         @param first_key: the key to loft from
         @param second_key: the key to loft to
         @param first_direction: the face to loft from
@@ -107,19 +264,52 @@ class KeyUtils(object):
 
             points = get_vertices(first_key.slot.get_cad_face(first_direction,first_key.base.relative_cartesian),
                                   second_key.slot.get_cad_face(second_direction, second_key.base.relative_cartesian))
-            return cqmore.Workplane().polyhedron(*cqmore.polyhedron.hull(points))
+            return KeyUtils.resolve_polyhedron_hull(points)
         else:
             def get_wire(face):
                 return face.first().wires().val()
 
             first_wire = get_wire(first_key.slot.get_cad_face(first_direction, first_key.base.relative_cartesian))
             second_wire = get_wire(second_key.slot.get_cad_face(second_direction, second_key.base.relative_cartesian))
-            return cadquery.Workplane(cadquery.Solid.makeLoft([first_wire, second_wire]))
+
+            first_points = [v.Center() for v in first_wire.Vertices()]
+            second_points = [v.Center() for v in second_wire.Vertices()]
+            anchor, local_points = KeyUtils.to_local_frame(first_points + second_points)
+            local_wires = workplane_to_brep(cadquery.Workplane().add([first_wire.translate(-anchor), second_wire.translate(-anchor)]))
+
+            return ConnectorTemplate(anchor, "face-loft",
+                                     (tuple(local_points[:len(first_points)]), tuple(local_points[len(first_points):])), (local_wires,))
+
+    @staticmethod
+    def key_face_connector(first_key: Key,
+                           second_key: Key,
+                           first_direction: Direction,
+                           second_direction: Direction,
+                           polyhedron_mode: bool) -> cadquery.Workplane:
+        """
+        Returns a loft/gap filler in between two key faces as specified the direction (see: resolve_key_face_connector).
+        """
+        return KeyUtils.build_connectors([KeyUtils.resolve_key_face_connector(first_key, second_key, first_direction, second_direction, polyhedron_mode)])[0]
+
+    @staticmethod
+    def attach_connectors(key_matrix: List[List[Key]], attachments: List[Tuple[int, int, Direction]], connectors: List[cadquery.Workplane]) -> None:
+        """
+        Attaches the connectors to the keys and exposes the cad objects once per key.
+        @param attachments: row, column and connector direction per connector
+        """
+        keys = dict()  # type: Dict[int, Key]
+        for (row, col, direction), connector in zip(attachments, connectors):
+            key = key_matrix[row][col]
+            key.connectors.get_connector(direction).set_cad_object(connector)
+            keys.setdefault(id(key), key)
+        for key in keys.values():
+            key.expose_cad_objects()
 
     @staticmethod
     def connect_keys_face(
             key_matrix: List[List[Key]],
-            connection_info: List[Tuple[int, int, Direction, int, int, Direction, bool]]) -> None:
+            connection_info: List[Tuple[int, int, Direction, int, int, Direction, bool]],
+            partition: Optional[str] = None) -> None:
         """
         Creates horizontal or vertical gap filler in between the keys as listed in the connection info.
 
@@ -134,43 +324,57 @@ class KeyUtils(object):
         │     │ ←a→ │     │
         ╰─────╯     ╰─────╯
 
+        The fillers are resolved first, then constructed in one batch (see: build_connectors) and finally attached.
+
         @param connection_info: information which keys to connect and which faces to use
         @param key_matrix: pool of keys with pre-computed placement and cad objects
+        @param partition: builds only the connectors attached to keys of this partition (see: DactylKey.partition), None for all
         """
         print("compute key to key connectors ({}) ...".format(len(connection_info)))
 
+        attachments = list()  # type: List[Tuple[int, int, Direction]]
+        templates = list()  # type: List[ConnectorTemplate]
         for a_row, a_idx, a_direction_x, b_row, b_col, b_direction_x, polyhedron_mode in connection_info:
             a = key_matrix[a_row][a_idx]
             b = key_matrix[b_row][b_col]
-            if a.slot.has_cad_object() and b.slot.has_cad_object():
+            if partition is not None and a.dactyl.partition != partition:
+                print("-", end="")
+            elif a.slot.has_cad_object() and b.slot.has_cad_object():
                 print(".", end="")
-                gap_filler = KeyUtils.key_face_connector(a, b, a_direction_x, b_direction_x, polyhedron_mode)
-                a.connectors.get_connector(a_direction_x).set_cad_object(gap_filler)
-
-                a.expose_cad_objects()
-                b.expose_cad_objects()
+                templates.append(KeyUtils.resolve_key_face_connector(a, b, a_direction_x, b_direction_x, polyhedron_mode))
+                attachments.append((a_row, a_idx, a_direction_x))
             else:
                 print("x", end="")
+
+        KeyUtils.attach_connectors(key_matrix, attachments, KeyUtils.build_connectors(templates, PERF.jobs))
         print("\ncompute key to key connectors: done")
 
     @staticmethod
     def connect_key_corner_edges(key_matrix: List[List[Key]],
-                                 connection_info: List[Tuple[int, int, List[Tuple[cadquery.Vector, cadquery.Vector]], Direction, bool]]) -> None:
+                                 connection_info: List[Tuple[int, int, List[Tuple[cadquery.Vector, cadquery.Vector]], Direction, bool]],
+                                 partition: Optional[str] = None) -> None:
         """
         Note: Use default (loft) filling method whenever possible; use polyhedron filling method only if loft is not possible.
         Complex polyhedrons most likely will not result in a nice tesselation.
         Lofts cannot be uses if keys have a rotation/displacement w.r.t. to the normal planar distribution.
+
+        The fillers are resolved first, then constructed in one batch (see: build_connectors) and finally attached.
+
+        @param partition: builds only the fillers attached to keys of this partition (see: DactylKey.partition), None for all
         """
         print("compute key corner-edge gap filler ({}) ...".format(len(connection_info)))
 
-        for gap_filler in connection_info:
+        attachments = list()  # type: List[Tuple[int, int, Direction]]
+        templates = list()  # type: List[ConnectorTemplate]
+        for row, col, edges, dest_direction, polyhedron_mode in connection_info:
+            if partition is not None and key_matrix[row][col].dactyl.partition != partition:
+                print("-", end="")
+                continue
             print(".", end="")
-            row, col, edges, dest_direction, polyhedron_mode = gap_filler
-            gap_filler = KeyUtils.loft_along_edges(edges) if not polyhedron_mode else KeyUtils.polyhedron_along_edges(edges)
-            key = key_matrix[row][col]
-            key.connectors.get_connector(dest_direction).set_cad_object(gap_filler)
-            key.expose_cad_objects()
+            templates.append(KeyUtils.resolve_loft_along_edges(edges) if not polyhedron_mode else KeyUtils.resolve_polyhedron_along_edges(edges))
+            attachments.append((row, col, dest_direction))
 
+        KeyUtils.attach_connectors(key_matrix, attachments, KeyUtils.build_connectors(templates, PERF.jobs))
         print("\ncompute key corner-edge gap filler: done")
 
     @staticmethod
@@ -226,19 +430,55 @@ class KeyUtils(object):
         print("filter cad objects: done")
 
     @staticmethod
-    def squash(key_matrix: List[List[Key]], do_unify: bool, do_clean_union: bool) -> Union[cadquery.Workplane, cadquery.Assembly]:
+    def squash_objects(key: Key) -> List[Tuple[str, cadquery.Workplane]]:
+        """
+        @return: the named cad objects of the key to squash: connectors first, then the key components
+        """
+        # key connectors
+        cad_objects = [c for c in key.cad_objects.connectors]
+        # key components
+        for c in key.cad_objects:
+            if type(c[1]) is list:
+                continue
+            if c[0] == "cap" and key.base.is_filled:
+                continue
+            cad_objects.append(c)
+        return cad_objects
+
+    @staticmethod
+    def instance(cq_object: cadquery.Workplane, prototypes: Dict[cadquery.Shape, cadquery.Workplane]) -> Tuple[cadquery.Workplane, Optional[cadquery.Location]]:
+        """
+        Splits a placed object into its prototype and location (see: CadKeyMixin.place, place_template).
+        Objects moved from the same shape share one prototype, thus an assembly refers to the prototype by location instead of copying it.
+        @param prototypes: prototype per shape without location, shared by all objects of one assembly
+        @return: prototype and location, or the object itself and None if it is not exactly one shape
+        """
+        shapes = cq_object.vals()
+        if len(shapes) != 1 or not isinstance(shapes[0], cadquery.Shape):
+            return cq_object, None
+        shape = shapes[0].located(cadquery.Location())
+        if shape not in prototypes:
+            prototypes[shape] = cadquery.Workplane().add(shape)
+        return prototypes[shape], shapes[0].location()
+
+    @staticmethod
+    def squash(key_matrix: List[List[Key]], do_unify: bool, do_clean_union: bool, partition: Optional[str] = None) -> Union[cadquery.Workplane, cadquery.Assembly]:
         """
         Squashes all available cad objects of any key to one unified compound or assembly.
+        A board-level tilt and tent is applied once per side by location, not per key (see: BoardTransform).
         @param key_matrix: pool of keys with pre-computed placement and cad objects
         @param do_unify: recommended True for step file, False for cadquery editor (cq-editor)
         @param do_clean_union: recommended False for prototyping, True has weak the performance
+        @param partition: squashes only the keys of this partition (see: DactylKey.partition), None for all
         @return cadquery.Workplane if do_unify else cadquery.Assembly
         """
 
         print("final assembly ({} squash method) ...".format("unify" if do_unify else "assembly"))
 
-        assembly = cadquery.Assembly()
-        union = cadquery.Workplane()  # type: cadquery.Workplane
+        board = BoardTransform(key_matrix)
+        assemblies = dict()  # type: Dict[str, cadquery.Assembly]
+        union_groups = dict()  # type: Dict[str, List[List[Tuple[str, cadquery.Workplane]]]]
+        prototypes = dict()  # type: Dict[cadquery.Shape, cadquery.Workplane]
 
         def map_color(dactyl_key: Key):
             if key.base.is_visible:
@@ -256,28 +496,54 @@ class KeyUtils(object):
             print("row {}".format(row_idx))
             for key in row:
                 print("  {:7}:".format(key.name), end=" ")
+                if partition is not None and key.dactyl.partition != partition:
+                    print("<{} partition>".format(key.dactyl.partition))
+                    continue
                 if not key.base.is_visible and not DEBUG.show_invisibles:
                     print("<key not visible>")
                     continue
 
-                # key connectors
-                cad_objects = [c for c in key.cad_objects.connectors]
-                # key components
-                for c in key.cad_objects:
-                    if type(c[1]) is list:
-                        continue
-                    if c[0] == "cap" and key.base.is_filled:
-                        continue
-                    cad_objects.append(c)
-
-                for name, cq_object in cad_objects:
+                side = board.side(key)
+                if side not in assemblies:
+                    assemblies[side] = cadquery.Assembly()
+                    union_groups[side] = list()
+                union_groups[side].append(list())
+                for name, cq_object in KeyUtils.squash_objects(key):
                     print("{}".format(name), end=" ")
                     if do_unify:
-                        union = union.union(cq_object, clean=do_clean_union)
+                        union_groups[side][-1].append((name, cq_object))
+                    elif PERF.assembly_instances:
+                        prototype, location = KeyUtils.instance(cq_object, prototypes)
+                        assemblies[side] = assemblies[side].add(prototype, loc=location, color=map_color(key))
                     else:
-                        assembly = assembly.add(cq_object, color=map_color(key))
+                        assemblies[side] = assemblies[side].add(cq_object, color=map_color(key))
 
                 print("")
             row_idx += 1
+
+        if not do_unify and PERF.assembly_instances:
+            print("assembly of {} objects refers to {} distinct shapes".format(sum(len(a.children) for a in assemblies.values()), len(prototypes)))
+        if do_unify:
+            print("unify {} objects ({} fuse, {} jobs) ...".format(
+                sum(len(group) for groups in union_groups.values() for group in groups), PERF.fuse_method, effective_jobs(PERF.jobs)))
+        if not board.is_active:
+            if do_unify:
+                union = fuse(union_groups.get("board", list()), PERF.fuse_method, do_clean_union, PERF.jobs)
+            else:
+                assembly = assemblies.get("board", cadquery.Assembly())
+        else:
+            # board-level transformation: one location per side instead of per key (see: BoardTransform)
+            print("board transformation ({}) of: {}".format(board.summary(), ", ".join(assemblies.keys())))
+            if do_unify:
+                union = cadquery.Workplane().add([shape.moved(board.location(side))
+                                                  for side, groups in union_groups.items()
+                                                  for shape in fuse(groups, PERF.fuse_method, do_clean_union, PERF.jobs).vals()])
+            else:
+                assembly = cadquery.Assembly()
+                for side, side_assembly in assemblies.items():
+                    assembly = assembly.add(side_assembly, name=side, loc=board.location(side))
         print("final assembly ({} squash method): done".format("unify" if do_unify else "assembly"))
         return union if do_unify else assembly
+
+
+Key.object_cache.register_namespace("connector", tolerance=PERF.connector_key_tolerance)
@@ -10,10 +10,18 @@ paths = [os.getcwd(), re.sub(".src$", "", os.getcwd())]
 
 from pathlib import Path
 from time import perf_counter
+from typing import Any, Optional, Tuple
 from model_importer import import_config, import_builder
-from cfg.debug import DEBUG
 import cadquery
-from keys.utils import KeyUtils
+# import from src package: the builder uses the same module instances (i.e. the object cache)
+from src.cfg.debug import DEBUG
+from src.cfg.perf import PERF
+from src.keys.key import Key, DactylKey
+from src.keys.key_mixins import POST_COMPUTE_STATISTICS
+from src.keys.utils import KeyUtils
+from src.keys.parallel import process_pool
+from src.keys.transport import send_shape, receive_shape, send_assembly, receive_assembly
+from src.keys import boolean
 
 cliargs, model_config = import_config()
 builder = import_builder()
@@ -22,13 +30,86 @@ builder = import_builder()
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
-def run(perf_counter_begin: float) -> None:
+def partition_filename(partition: str) -> str:
+    stem, suffix = os.path.splitext(cliargs.filename)
+    return os.path.abspath(os.path.join(cliargs.path, "{}-{}{}".format(stem, partition, suffix)))
+
+
+def run_partition(args: Tuple[str, bool, bool, bool, bool]) -> Tuple[str, int, Tuple[float, float, float], Optional[str], Any, Tuple[Tuple, Tuple]]:
+    """
+    Worker: builds, squashes and exports one partition (see: DactylKey.partition).
+    @return: partition, number of keys, seconds elapsed for construction, unifying objects and export, the exported file if any,
+             the squashed partition for transport if requested (see: send_shape, send_assembly)
+             and the counters of boolean operations and placed keys before and after
+    """
+    partition, do_unify, do_clean_union, do_export, do_send = args
+    # the partitions already run in parallel
+    PERF.jobs = 1
+    counters_before = boolean.BOOLEAN_STATISTICS.counters(), POST_COMPUTE_STATISTICS.counters()
+
+    pc_1 = perf_counter()
+    key_matrix = builder.compute(do_unify=do_unify, partition=partition)
+    pc_2 = perf_counter()
+    keys = len([key for row in key_matrix for key in row if key.dactyl.partition == partition])
+    if keys < 1:
+        return partition, 0, (pc_2 - pc_1, 0.0, 0.0), None, None, (counters_before, (boolean.BOOLEAN_STATISTICS.counters(), POST_COMPUTE_STATISTICS.counters()))
+
+    squashed = KeyUtils.squash(key_matrix, do_unify=do_unify, do_clean_union=do_clean_union, partition=partition)
+    pc_3 = perf_counter()
+
+    filename = None
+    if do_export:
+        filename = partition_filename(partition)
+        cadquery.Assembly().add(squashed, name=partition).save(filename)
+    pc_4 = perf_counter()
+    sent = (send_shape(squashed) if do_unify else send_assembly(squashed)) if do_send else None
+    return partition, keys, (pc_2 - pc_1, pc_3 - pc_2, pc_4 - pc_3), filename, sent, (counters_before, (boolean.BOOLEAN_STATISTICS.counters(), POST_COMPUTE_STATISTICS.counters()))
+
+
+def run_partitioned(do_unify: bool, do_clean_union: bool) -> None:
+    """
+    Builds and exports each partition in its own process: the wall time is the one of the largest partition.
+    Optionally the partitions are combined into one assembly; the partition processes pass their squashed objects back for this,
+    thus the exported files are not parsed again.
+    """
+    pc_1 = perf_counter()
+    do_combine = cliargs.export and cliargs.combined
+    args = [(partition, do_unify, do_clean_union, cliargs.export, do_combine) for partition in DactylKey.partitions]
+    with process_pool(len(args)) as executor:
+        results = list(executor.map(run_partition, args))
+    pc_2 = perf_counter()
+
+    print("\npartitions:")
+    combined = cadquery.Assembly()
+    for partition, keys, (construction, unifying, export), filename, sent, (counters_before, counters_after) in results:
+        boolean.BOOLEAN_STATISTICS.add_counters(counters_before[0], counters_after[0])
+        POST_COMPUTE_STATISTICS.add_counters(counters_before[1], counters_after[1])
+        print("  {:7} {:3} keys: {:.3f}s construction, {:.3f}s unifying objects, {:.3f}s export".format(partition, keys, construction, unifying, export))
+        if filename is not None:
+            print("          exported to: {} size: {:,} kB".format(filename, Path(filename).stat().st_size))
+        if sent is not None:
+            combined.add(receive_shape(sent) if do_unify else receive_assembly(sent), name=partition)
+    print("{:.3f}s elapsed for partitioned build".format(pc_2 - pc_1))
+
+    if do_combine and len(combined.children) > 0:
+        filename = partition_filename("combined")
+        print("exporting combined assembly to: {}".format(filename))
+        combined.save(filename)
+        print("exported to: {} size: {:,} kB".format(filename, Path(filename).stat().st_size))
+        print("{:.3f}s elapsed for combined export".format(perf_counter() - pc_2))
+
+
+def run(perf_counter_begin: float, is_invoked_by_cli: bool) -> None:
     pc_1 = perf_counter()
-    is_invoked_by_cli = __name__ == "__main__"
     do_unify = DEBUG.export_unified if is_invoked_by_cli else DEBUG.render_unified
     do_clean_union = DEBUG.export_cleaned_union if is_invoked_by_cli else DEBUG.render_cleaned_union
 
     print("{:.3f}s elapsed for loading".format(pc_1 - perf_counter_begin))
+    if is_invoked_by_cli and cliargs.partitioned:
+        run_partitioned(do_unify, do_clean_union)
+        print_summary(is_invoked_by_cli, do_unify, do_clean_union)
+        return
+
     key_matrix = builder.compute(do_unify=do_unify)
     pc_2 = perf_counter()
     print("{:.3f}s elapsed for construction".format(pc_2 - pc_1))
@@ -48,21 +129,40 @@ def run(perf_counter_begin: float) -> None:
     else:
         show_object(squashed)
 
+    print_summary(is_invoked_by_cli, do_unify, do_clean_union)
+
+
+def print_summary(is_invoked_by_cli: bool, do_unify: bool, do_clean_union: bool) -> None:
     print("\ninvocation:")
     print("  invoked by:                        {}".format("command line" if is_invoked_by_cli else "cadquery editor"))
     if is_invoked_by_cli:
         print("  export requested:                  {}".format("yes" if cliargs.export else "no (dry run)"))
+        print("  partitioned:                       {}".format(("yes, combined" if cliargs.combined else "yes") if cliargs.partitioned else "no"))
     print("  unify vs. assembly:                {}".format("unify" if do_unify else "assembly"))
     if do_unify:
         print("  clean to have a clean shape union: {}".format("yes" if do_clean_union else "no"))
+    print("  boolean options:                   {}".format(boolean.options_summary()))
+    print("  boolean operations:                {} in {:.3f}s".format(boolean.BOOLEAN_STATISTICS.operations, boolean.BOOLEAN_STATISTICS.seconds))
+    print("  keys placed:                       {} in {:.3f}s".format(POST_COMPUTE_STATISTICS.keys, POST_COMPUTE_STATISTICS.seconds))
+
+    print("")
+    Key.object_cache.print_statistics()
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
 
-pc_0 = perf_counter()
-print("\nstarted run at {:.3f}".format(pc_0))
-run(perf_counter_begin=pc_0)
-pc_5 = perf_counter()
-print("\n{:.3f}s elapsed total".format(pc_5 - pc_0))
-print("finished run at {:.3f}\n".format(pc_0))
+def main(is_invoked_by_cli: bool) -> None:
+    pc_0 = perf_counter()
+    print("\nstarted run at {:.3f}".format(pc_0))
+    run(perf_counter_begin=pc_0, is_invoked_by_cli=is_invoked_by_cli)
+    pc_5 = perf_counter()
+    print("\n{:.3f}s elapsed total".format(pc_5 - pc_0))
+    print("finished run at {:.3f}\n".format(pc_0))
+
+
+if __name__ == "__main__":
+    main(is_invoked_by_cli=True)
+elif __name__ != "__mp_main__":
+    # loaded by cq-editor; worker processes started by spawn (see: process_pool) import this module as __mp_main__ and must not build the model
+    main(is_invoked_by_cli=False)
@@ -1,5 +1,6 @@
 import importlib
 from cli_args import cli_args
+from src.cfg.perf import PERF
 
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -10,12 +11,36 @@ def import_config():
     prerequisites: any model is placed in src/keyboards/ and must provide
       - src/keyboards/<model_name>/config.py
         - class ModelConfig
+        - optional: ModelConfig.board (BoardConfig) for board-level tilt and tent
     """
     args = cli_args()
     model_module = args.selected_model[0]
     importlib.invalidate_caches()
     model_config = importlib.import_module(".config", model_module)
     model_config.MODEL_CONFIG.matrix.layout_size = args.keyboard_size
+    # the board configuration is optional (see: BoardTransform)
+    board = getattr(model_config.MODEL_CONFIG, "board", None)
+    if board is None and (args.tilt is not None or args.tent is not None):
+        raise ValueError("--tilt/--tent: the model config of {} has no board config (see: BoardConfig)".format(model_module))
+    if args.tilt is not None:
+        board.tilt = args.tilt
+    if args.tent is not None:
+        board.tent = args.tent
+    PERF.use_disk_cache = PERF.use_disk_cache and not args.no_disk_cache
+    if args.cache_dir is not None:
+        PERF.disk_cache_dir = args.cache_dir
+    if args.jobs is not None:
+        PERF.jobs = args.jobs
+    if args.shape_transport is not None:
+        PERF.shape_transport = args.shape_transport
+    if args.fuse_method is not None:
+        PERF.fuse_method = args.fuse_method
+    if args.clean_mode is not None:
+        PERF.clean_mode = args.clean_mode
+    PERF.assembly_instances = PERF.assembly_instances and not args.no_instances
+    PERF.boolean_options = PERF.boolean_options and not args.plain_booleans
+    if args.fuzzy_value is not None:
+        PERF.boolean_fuzzy_value = args.fuzzy_value
     return args, model_config
 
 